@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from topological_photonics import bench
+
+
+class BenchmarkTests(unittest.TestCase):
+    def test_report_records_machine_info_and_timings(self):
+        report = bench.run_benchmarks(quick=True, repeat=1, min_time=0.0, match="step/banded",
+                                      verbose=False)
+
+        self.assertIn("numpy", report["machine"])
+        self.assertEqual(sorted(report["results"]), [
+            "diamond/step/banded/n_cells=10", "diamond/step/banded/n_cells=100",
+            "nrssh/step/banded/n_cells=10", "nrssh/step/banded/n_cells=100",
+        ])
+        for timing in report["results"].values():
+            self.assertGreater(timing["best"], 0)
+            self.assertLessEqual(timing["best"], timing["median"])
+
+    def test_slower_cases_are_flagged_against_baseline(self):
+        baseline = {"results": {"a": {"best": 1.0}, "b": {"best": 1.0}, "gone": {"best": 1.0}}}
+        report = {"results": {"a": {"best": 1.1}, "b": {"best": 1.5}, "new": {"best": 9.0}}}
+
+        self.assertEqual(bench.compare_to_baseline(report, baseline, threshold=0.2),
+                         [("b", 1.0, 1.5, 1.5)])
+
+    def test_command_line_writes_report_and_fails_on_regression(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            output = os.path.join(tmpdir, "report.json")
+            with contextlib.redirect_stdout(io.StringIO()):
+                status = bench.main(["--quick", "--repeat", "1", "--match", "nrssh/step/banded/n_cells=10",
+                                     "--output", output])
+            self.assertEqual(status, 0)
+
+            with open(output) as handle:
+                report = json.load(handle)
+            report["results"]["nrssh/step/banded/n_cells=10"]["best"] /= 100
+            baseline = os.path.join(tmpdir, "baseline.json")
+            with open(baseline, "w") as handle:
+                json.dump(report, handle)
+
+            with contextlib.redirect_stdout(io.StringIO()) as printed:
+                status = bench.main(["--quick", "--repeat", "1", "--match", "nrssh/step/banded/n_cells=10",
+                                     "--baseline", baseline])
+            self.assertEqual(status, 1)
+            self.assertIn("REGRESSION nrssh/step/banded/n_cells=10", printed.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+from topological_photonics.phases import nrssh_phase_diagrams
+from topological_photonics.phases.cache import ResultCache, point_key
+
+
+class ResultCacheTests(unittest.TestCase):
+    def test_point_key_depends_on_model_parameters_and_solver_settings(self):
+        system = NRSSHLatticeSystem(n_cells=2, v=0.2, u=0.5, r=0.9, gamma1=0.3, gamma2=0.1)
+        key = point_key(system, 0.1, 1e-2, 50)
+
+        self.assertEqual(key, point_key(
+            NRSSHLatticeSystem(n_cells=2, v=0.2, u=0.5, r=0.9, gamma1=0.3, gamma2=0.1), 0.1, 1e-2, 50
+        ))
+        self.assertNotEqual(key, point_key(
+            NRSSHLatticeSystem(n_cells=2, v=0.2, u=0.5, r=0.9, gamma1=0.3, gamma2=0.2), 0.1, 1e-2, 50
+        ))
+        self.assertNotEqual(key, point_key(system, 0.05, 1e-2, 50))
+        self.assertNotEqual(key, point_key(system, 0.1, 1e-2, 50, {"adaptive": True}))
+        self.assertNotEqual(key, point_key(DiamondLatticeSystem(n_cells=2, gamma1=0.3, gamma2=0.1),
+                                           0.1, 1e-2, 50))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ResultCache(os.path.join(tmpdir, "cache.sqlite"), max_entries=2) as cache:
+                cache.put_many([("a", 1.0, True)])
+                time.sleep(0.01)
+                cache.put_many([("b", 2.0, False)])
+                time.sleep(0.01)
+                cache.get_many(["a"])
+                time.sleep(0.01)
+                cache.put_many([("c", 3.0, True)])
+
+                self.assertEqual(len(cache), 2)
+                self.assertEqual(cache.get_many(["a", "b", "c"]), {"a": (1.0, True), "c": (3.0, True)})
+
+    def test_phase_diagram_reuses_cached_points(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "cache.sqlite")
+            kwargs = dict(points=3, n_cells=2, max_time=2, plot=False, verbose=False, cache=path)
+
+            first = nrssh_phase_diagrams.create_phase_diagram(**kwargs)
+            with mock.patch("topological_photonics.phases.common.find_convergence_time",
+                            side_effect=AssertionError("point was recomputed")):
+                second = nrssh_phase_diagrams.create_phase_diagram(**kwargs)
+
+            np.testing.assert_array_equal(second[2], first[2])
+            np.testing.assert_array_equal(second[3], first[3])
+
+            with ResultCache(path) as cache:
+                self.assertEqual(len(cache), 9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from topological_photonics.phases import common, nrssh_phase_diagrams
+
+
+class CheckpointTests(unittest.TestCase):
+    def test_interrupted_sweep_resumes_from_checkpoint(self):
+        kwargs = dict(points=3, n_cells=2, max_time=2, plot=False, verbose=False)
+        reference = nrssh_phase_diagrams.create_phase_diagram(**kwargs)
+
+        evaluate = common.find_convergence_time
+        calls = []
+
+        def interrupt_after_four(*args, **options):
+            if len(calls) == 4:
+                raise KeyboardInterrupt
+            calls.append(args)
+            return evaluate(*args, **options)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sweep.npz")
+
+            with mock.patch("topological_photonics.phases.common.find_convergence_time",
+                            side_effect=interrupt_after_four):
+                with self.assertRaises(KeyboardInterrupt):
+                    nrssh_phase_diagrams.create_phase_diagram(checkpoint=path, **kwargs)
+
+            with np.load(path) as data:
+                self.assertEqual(int(np.sum(data["completed"])), 4)
+
+            calls.clear()
+            with mock.patch("topological_photonics.phases.common.find_convergence_time",
+                            side_effect=lambda *args, **options: calls.append(args) or evaluate(*args, **options)):
+                resumed = nrssh_phase_diagrams.create_phase_diagram(checkpoint=path, resume=True, **kwargs)
+
+            self.assertEqual(len(calls), 5)
+            np.testing.assert_array_equal(resumed[2], reference[2])
+            np.testing.assert_array_equal(resumed[3], reference[3])
+
+    def test_checkpoint_from_a_different_sweep_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sweep.npz")
+            kwargs = dict(points=2, n_cells=2, plot=False, verbose=False, checkpoint=path)
+
+            nrssh_phase_diagrams.create_phase_diagram(max_time=2, **kwargs)
+
+            with self.assertRaises(ValueError):
+                nrssh_phase_diagrams.create_phase_diagram(max_time=3, resume=True, **kwargs)
+
+    def test_checkpoint_of_a_different_lattice_is_rejected(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sweep.npz")
+            kwargs = dict(points=2, max_time=2, plot=False, verbose=False, checkpoint=path)
+
+            nrssh_phase_diagrams.create_phase_diagram(n_cells=2, **kwargs)
+
+            for changed in (dict(n_cells=40), dict(n_cells=2, backend="dense"),
+                            dict(n_cells=2, method="krylov")):
+                with self.subTest(**changed), self.assertRaises(ValueError):
+                    nrssh_phase_diagrams.create_phase_diagram(resume=True, **changed, **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+
+class ComputeOnlyImportTests(unittest.TestCase):
+    def test_solvers_import_without_matplotlib(self):
+        code = (
+            "import sys\n"
+            "from topological_photonics.dynamics import diamond_gain_loss, diamond_time_evolution\n"
+            "from topological_photonics.dynamics import nrssh_gain_loss, nrssh_time_evolution, stationary\n"
+            "from topological_photonics.phases import diamond_phase_diagrams, nrssh_phase_diagrams\n"
+            "from topological_photonics.phases.common import find_convergence_time\n"
+            "nrssh_phase_diagrams.create_phase_diagram(points=2, n_cells=2, max_time=1, plot=False, verbose=False)\n"
+            "assert 'matplotlib' not in sys.modules, 'matplotlib was imported'\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[1],
+                                capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from topological_photonics.instrumentation import StepProfiler
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+from topological_photonics.phases import nrssh_phase_diagrams
+from topological_photonics.phases.common import find_convergence_time
+
+
+class StepProfilerTests(unittest.TestCase):
+    def test_convergence_search_records_every_section_once_per_step(self):
+        for backend in ("dense", "banded", "sparse"):
+            profiler = StepProfiler()
+            system = DiamondLatticeSystem(n_cells=3, gamma1=0.5, gamma2=0.2, backend=backend)
+            time, converged = find_convergence_time(system, max_time=5, profiler=profiler)
+
+            steps = int(round(time / 0.1))
+            self.assertEqual(profiler.steps, steps)
+            for name in StepProfiler.SECTIONS:
+                self.assertEqual(profiler.calls[name], steps, (backend, name))
+                self.assertGreater(profiler.timings[name], 0.0)
+            self.assertEqual(len(profiler.runs), 1)
+            self.assertEqual(profiler.runs[0]["converged"], converged)
+
+    def test_results_do_not_depend_on_profiling(self):
+        system = NRSSHLatticeSystem(n_cells=5, v=0.2, u=0.5, r=0.9, gamma1=0.5, gamma2=0.2)
+        self.assertEqual(find_convergence_time(system, max_time=5),
+                         find_convergence_time(system, max_time=5, profiler=StepProfiler()))
+
+    def test_phase_grid_profiles_every_point_and_dumps_report(self):
+        for batched in (False, True):
+            profiler = StepProfiler()
+            nrssh_phase_diagrams.create_phase_diagram(points=2, n_cells=2, max_time=2, plot=False,
+                                                      verbose=False, batched=batched, profiler=profiler)
+            self.assertEqual(len(profiler.runs), 4)
+
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, "profile.json")
+                profiler.dump(path)
+                with open(path) as handle:
+                    report = json.load(handle)
+
+            self.assertEqual(report["steps"], profiler.steps)
+            self.assertAlmostEqual(sum(entry["fraction"] for entry in report["sections"].values()), 1.0)
+            self.assertIn("4 runs", profiler.summary())
+            self.assertTrue(np.all(np.isfinite([run["norm"] for run in report["runs"]])))
+
+    def test_profiler_is_rejected_with_pool_workers(self):
+        with self.assertRaises(ValueError):
+            nrssh_phase_diagrams.create_phase_diagram(points=2, n_cells=2, max_time=2, plot=False,
+                                                      verbose=False, workers=2, profiler=StepProfiler())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import pickle
 import tempfile
 import unittest
+from functools import partial
 from pathlib import Path
 
 import matplotlib
@@ -7,10 +9,17 @@ import numpy as np
 
 matplotlib.use("Agg")
 
+import matplotlib.pyplot as plt
+
+from scipy.linalg import solve_banded
+
+from topological_photonics.models.common import (banded_matvec, crank_nicolson_step, crank_nicolson_step_batched,
+                                                  solve_banded_batched)
 from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
 from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
 from topological_photonics.dynamics import diamond_gain_loss, diamond_time_evolution, nrssh_gain_loss, nrssh_time_evolution
 from topological_photonics.phases import diamond_phase_diagrams, nrssh_phase_diagrams
+from topological_photonics.phases.common import create_refined_phase_grid, plot_phase_diagram_base
 from topological_photonics.plotting import output_file
 
 
@@ -86,6 +95,19 @@ class NumericalBehaviorTests(unittest.TestCase):
         np.testing.assert_allclose(np.diag(H)[1::3].imag, np.full(2, -0.2))
         np.testing.assert_allclose(np.diag(H)[2::3].imag, np.full(2, -0.2))
 
+    def test_gain_loss_diagonal_uses_sublattice_profiles(self):
+        system = DiamondLatticeSystem(n_cells=2, gamma1=0.6, gamma2=0.2, S=2.0)
+        phi = np.sqrt(np.arange(system.N, dtype=float)) + 0j
+
+        diagonal = system.gain_loss_diagonal(phi)
+
+        np.testing.assert_array_equal(system.sublattices["A"], [0, 3, 6])
+        np.testing.assert_array_equal(system.sublattices["C"], [2, 5])
+        np.testing.assert_allclose(diagonal[0::3].imag, 0.6 / (1 + 2.0 * np.array([0, 3, 6])))
+        np.testing.assert_allclose(diagonal[1::3].imag, -0.2)
+        np.testing.assert_allclose(diagonal[2::3].imag, -0.2)
+        np.testing.assert_allclose(np.diag(system.get_hamiltonian(phi, onsite=0.5)), 0.5 + diagonal)
+
     def test_time_evolution_operators_are_finite(self):
         nrssh_system = NRSSHLatticeSystem(n_cells=2, v=0.2, u=0.5, r=0.9)
         nrssh_U = nrssh_system.time_evolution_operator(nrssh_system.get_hamiltonian(), 0.05)
@@ -98,6 +120,129 @@ class NumericalBehaviorTests(unittest.TestCase):
         self.assertTrue(np.all(np.isfinite(nrssh_U)))
         self.assertTrue(np.all(np.isfinite(diamond_U)))
 
+    def test_nrssh_banded_step_matches_dense_propagator(self):
+        banded = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2)
+        dense = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2,
+                                   backend="dense")
+        phi = np.linspace(0.1, 1.0, banded.N) * np.exp(1j * np.arange(banded.N))
+
+        np.testing.assert_allclose(banded.step(phi, 0.1), dense.step(phi, 0.1), atol=1e-12)
+        np.testing.assert_allclose(
+            banded.step(phi, 0.1),
+            dense.time_evolution_operator(dense.get_hamiltonian(phi), 0.1) @ phi,
+            atol=1e-12,
+        )
+
+    def test_nrssh_backends_give_same_convergence_time(self):
+        times = [
+            nrssh_phase_diagrams.find_convergence_time(
+                NRSSHLatticeSystem(n_cells=3, v=0.2, u=0.5, r=0.9, gamma1=0.2, gamma2=0.6,
+                                   backend=backend),
+                max_time=5,
+            )
+            for backend in ("banded", "dense")
+        ]
+
+        self.assertEqual(times[0][1], times[1][1])
+        self.assertAlmostEqual(times[0][0], times[1][0])
+
+    def test_hopping_bands_match_dense_hamiltonians(self):
+        systems = [
+            NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9),
+            DiamondLatticeSystem(n_cells=4, t1=0.1, t2=0.2, t3=0.3, t4=0.4),
+        ]
+
+        for system in systems:
+            x = np.exp(1j * np.arange(system.N)) * np.arange(1, system.N + 1)
+            np.testing.assert_allclose(
+                banded_matvec(system.H_bands, system.lower, system.upper, x),
+                system.H_base @ x,
+            )
+
+    def test_diamond_banded_step_matches_dense_propagator(self):
+        banded = DiamondLatticeSystem(n_cells=4, t1=0.1, t2=0.2, t3=0.3, t4=0.4,
+                                      gamma1=0.6, gamma2=0.2)
+        dense = DiamondLatticeSystem(n_cells=4, t1=0.1, t2=0.2, t3=0.3, t4=0.4,
+                                     gamma1=0.6, gamma2=0.2, backend="dense")
+        phi = np.linspace(0.1, 1.0, banded.N) * np.exp(1j * np.arange(banded.N))
+
+        np.testing.assert_allclose(banded.step(phi, 0.1), dense.step(phi, 0.1), atol=1e-12)
+
+    def test_banded_backend_does_not_allocate_dense_hamiltonian(self):
+        system = DiamondLatticeSystem(n_cells=40000)
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+
+        phi = system.step(phi, 0.1)
+
+        self.assertNotIn("H_base", vars(system))
+        self.assertEqual(phi.shape, (120001,))
+        self.assertTrue(np.all(np.isfinite(phi)))
+
+    def test_sparse_backend_matches_banded_backend(self):
+        pairs = [
+            (NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2),
+             NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2,
+                                backend="sparse")),
+            (DiamondLatticeSystem(n_cells=4, t1=0.1, t2=0.2, t3=0.3, t4=0.4, gamma1=0.6, gamma2=0.2),
+             DiamondLatticeSystem(n_cells=4, t1=0.1, t2=0.2, t3=0.3, t4=0.4, gamma1=0.6, gamma2=0.2,
+                                  backend="sparse")),
+        ]
+
+        for banded, sparse_system in pairs:
+            phi = np.linspace(0.1, 1.0, banded.N) * np.exp(1j * np.arange(banded.N))
+
+            np.testing.assert_allclose(sparse_system.H_base.toarray(), banded.H_base)
+            np.testing.assert_allclose(
+                sparse_system.get_hamiltonian(phi, onsite=0.3).toarray(),
+                banded.get_hamiltonian(phi, onsite=0.3),
+            )
+            np.testing.assert_allclose(sparse_system.step(phi, 0.1), banded.step(phi, 0.1),
+                                       atol=1e-12)
+            np.testing.assert_allclose(sparse_system.step(phi, 0.05), banded.step(phi, 0.05),
+                                       atol=1e-12)
+
+    def test_linear_systems_reuse_one_factorized_propagator(self):
+        for model in (NRSSHLatticeSystem, DiamondLatticeSystem):
+            for backend in ("dense", "banded", "sparse"):
+                for gains in (dict(gamma1=0.0, gamma2=0.3), dict(gamma1=0.5, gamma2=0.3, S=0.0)):
+                    system = model(n_cells=4, backend=backend, **gains)
+                    phi = np.linspace(0.1, 1.0, system.N) + 0.5j
+                    expected = crank_nicolson_step(system.H_bands, system.lower, system.upper,
+                                                   0.2 + system.gain_loss_diagonal(phi), phi, 0.1)
+
+                    self.assertTrue(system.is_linear)
+                    for _ in range(3):
+                        np.testing.assert_allclose(system.step(phi, 0.1, onsite=0.2), expected,
+                                                   atol=1e-14)
+                    self.assertEqual(len(system._linear_propagators), 1)
+
+        self.assertFalse(NRSSHLatticeSystem(n_cells=4, gamma1=0.5, gamma2=0.3).is_linear)
+
+    def test_fast_forward_matches_repeated_steps(self):
+        for method in ("cayley", "strang"):
+            for backend in ("dense", "banded", "sparse"):
+                system = DiamondLatticeSystem(n_cells=4, gamma1=0.0, gamma2=0.3, method=method,
+                                              backend=backend)
+                phi0 = np.zeros(system.N, dtype=complex)
+                phi0[0] = 1.0
+
+                phi = phi0
+                for _ in range(25):
+                    phi = system.step(phi, 0.1)
+
+                np.testing.assert_allclose(system.fast_forward(phi0, 0.1, 25), phi, atol=1e-13)
+                if backend != "dense":
+                    # the one-step matrix comes from the backend's own operator, never a dense H
+                    self.assertNotIsInstance(vars(system).get("H_base"), np.ndarray, (method, backend))
+
+        with self.assertRaises(ValueError):
+            NRSSHLatticeSystem(n_cells=2, gamma1=0.5).fast_forward(phi0[:4], 0.1, 10)
+
+    def test_invalid_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            NRSSHLatticeSystem(n_cells=2, backend="qr")
+
     def test_short_time_evolution_returns_finite_wavefunctions(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             nrssh_phi, nrssh_system = nrssh_time_evolution.plot_example_evolution(
@@ -203,6 +348,121 @@ class PhaseGridTests(unittest.TestCase):
         self.assertTrue(np.all(np.isfinite(convergence_times)))
         self.assertTrue(np.all(convergence_times <= 0.1))
 
+    def test_phase_grids_honor_sparse_backend(self):
+        nrssh_grid = nrssh_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=0.5, plot=False, verbose=False, backend="sparse",
+        )
+        diamond_grid = diamond_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=1, max_time=0.5, plot=False, verbose=False, backend="sparse",
+        )
+        reference = nrssh_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=0.5, plot=False, verbose=False,
+        )
+
+        np.testing.assert_allclose(nrssh_grid[2], reference[2])
+        np.testing.assert_array_equal(nrssh_grid[3], reference[3])
+        self.assertTrue(np.all(np.isfinite(diamond_grid[2])))
+
+    def test_batched_banded_solver_matches_lapack(self):
+        rng = np.random.default_rng(0)
+
+        for lower, upper in [(1, 1), (2, 2)]:
+            ab = rng.normal(size=(lower + upper + 1, 7, 3)) + 1j * rng.normal(size=(lower + upper + 1, 7, 3))
+            ab[upper] += 10
+            rhs = rng.normal(size=(7, 3)) + 0j
+            expected = np.stack([solve_banded((lower, upper), ab[..., k], rhs[:, k]) for k in range(3)], axis=-1)
+
+            solution, failed = solve_banded_batched(lower, upper, ab.copy(), rhs.copy())
+            np.testing.assert_allclose(solution, expected, atol=1e-12)
+            self.assertFalse(failed.any())
+
+    def test_batched_step_pivots_matrices_that_are_not_diagonally_dominant(self):
+        rng = np.random.default_rng(1)
+        hopping_bands = rng.normal(size=(3, 6, 3)) + 1j * rng.normal(size=(3, 6, 3))
+        hopping_bands[0, 0] = hopping_bands[2, -1] = 0
+        diagonals = rng.normal(size=(6, 3)) + 0j
+        phis = rng.normal(size=(6, 3)) + 0j
+        # A zero first pivot, and diagonal entries of 1e-3 on every site
+        diagonals[0, 1] = 1j - hopping_bands[1, 0, 1]
+        diagonals[:, 2] = 1j * (1 - 1e-3) - hopping_bands[1, :, 2]
+
+        ab = 1j * hopping_bands
+        ab[1] += 1 + 1j * diagonals
+        _, failed = solve_banded_batched(1, 1, ab, np.ones((6, 3), dtype=complex))
+        self.assertFalse(failed[0])
+        self.assertTrue(failed[1])
+
+        expected = np.stack([crank_nicolson_step(hopping_bands[..., k], 1, 1, diagonals[:, k], phis[:, k], 2.0)
+                             for k in range(3)], axis=-1)
+        with np.errstate(all="raise"):
+            solution = crank_nicolson_step_batched(hopping_bands, 1, 1, diagonals, phis, 2.0)
+        np.testing.assert_allclose(solution, expected, atol=1e-10)
+
+    def test_batched_phase_grids_match_serial_grids(self):
+        for module, n_cells in [(nrssh_phase_diagrams, 3), (diamond_phase_diagrams, 2)]:
+            serial = module.create_phase_diagram(
+                points=4, n_cells=n_cells, max_time=3, plot=False, verbose=False,
+            )
+            batched = module.create_phase_diagram(
+                points=4, n_cells=n_cells, max_time=3, plot=False, verbose=False, batched=True,
+            )
+
+            np.testing.assert_allclose(batched[2], serial[2])
+            np.testing.assert_array_equal(batched[3], serial[3])
+
+    def test_process_pool_phase_grids_match_serial_grids(self):
+        for module, n_cells in [(nrssh_phase_diagrams, 3), (diamond_phase_diagrams, 2)]:
+            serial = module.create_phase_diagram(
+                points=3, n_cells=n_cells, max_time=3, plot=False, verbose=False,
+            )
+            pooled = module.create_phase_diagram(
+                points=3, n_cells=n_cells, max_time=3, plot=False, verbose=False, workers=2,
+            )
+
+            np.testing.assert_allclose(pooled[2], serial[2])
+            np.testing.assert_array_equal(pooled[3], serial[3])
+
+    def test_refined_phase_grid_simulates_fewer_points_and_matches_uniform_grid(self):
+        factory = partial(nrssh_phase_diagrams.build_system, n_cells=4, v=0.5, u=0.5, r=0.5, S=5.0)
+        uniform = nrssh_phase_diagrams.create_phase_diagram(
+            points=17, n_cells=4, max_time=20, plot=False, verbose=False, batched=True,
+        )
+        *refined, simulated = create_refined_phase_grid(
+            3, 3, factory, "", dt=0.1, tolerance=1e-2, max_time=20, verbose=False, batched=True,
+        )
+
+        self.assertEqual(refined[2].shape, (17, 17))
+        self.assertLess(np.sum(simulated), 17 * 17 // 2)
+        np.testing.assert_allclose(refined[2][simulated], uniform[2][simulated])
+        np.testing.assert_array_equal(refined[3], uniform[3])
+
+    def test_traced_boundary_separates_converged_and_unconverged_points(self):
+        gamma1_array, boundary, simulations = nrssh_phase_diagrams.trace_phase_boundary(
+            n_cells=10, points=6, epsilon=1e-3, verbose=False,
+        )
+
+        self.assertTrue(np.isnan(boundary[0]))
+        self.assertLess(simulations, 6 * 20)
+        for gamma1, gamma2 in zip(gamma1_array, boundary):
+            if np.isnan(gamma2):
+                continue
+            outcomes = [
+                nrssh_phase_diagrams.find_convergence_time(
+                    nrssh_phase_diagrams.build_system(gamma1, g, n_cells=10, v=0.5, u=0.5, r=0.5, S=5.0),
+                    max_time=50,
+                )[1]
+                for g in (max(0.0, gamma2 - 1e-3), gamma2 + 1e-3)
+            ]
+            self.assertNotEqual(outcomes[0], outcomes[1])
+
+    def test_phase_system_factories_are_picklable(self):
+        factory = partial(diamond_phase_diagrams.build_system, n_cells=1, t1=0.1, t2=0.2,
+                          t3=0.3, t4=0.4, S=1.0)
+        system = pickle.loads(pickle.dumps(factory))(0.4, 0.3)
+
+        self.assertIsInstance(system, DiamondLatticeSystem)
+        self.assertEqual((system.gamma1, system.gamma2), (0.4, 0.3))
+
     def test_phase_grid_rejects_zero_points(self):
         with self.assertRaises(ValueError):
             nrssh_phase_diagrams.create_phase_diagram(points=0, plot=False, verbose=False)
@@ -219,6 +479,28 @@ class PlotPathTests(unittest.TestCase):
             self.assertEqual(filename, str(Path(tmpdir, "nested", "path", "plot.png")))
             self.assertTrue(Path(filename).parent.exists())
 
+    def test_phase_diagram_is_drawn_as_a_single_masked_mesh(self):
+        gamma_values = np.linspace(0, 1, 3)
+        convergence_times = np.array([[0.0, 10.0, 20.0], [30.0, 49.9, 55.0], [5.0, 5.0, 5.0]])
+        converged_mask = np.array([[True, True, True], [True, True, True], [False, True, True]])
+
+        plot_phase_diagram_base(gamma_values, gamma_values, convergence_times, converged_mask,
+                                1.0, 0.1, 1e-2, 50, "")
+        try:
+            collections = plt.gca().collections
+            self.assertEqual(len(collections), 1)
+
+            mesh = collections[0]
+            cells = mesh.get_array()
+            self.assertEqual(int(np.ma.count_masked(cells)), 1)
+            self.assertTrue(np.ma.getmaskarray(cells).reshape(3, 3)[0, 2])
+
+            # Same bins as the old per-point color index int(n_colors / max_time * t)
+            expected = np.minimum((convergence_times.T * 50 / 50).astype(int), 49)
+            np.testing.assert_array_equal(mesh.norm(convergence_times.T), expected)
+        finally:
+            plt.close()
+
     def test_diamond_mixed_hopping_plot_creates_output_directory(self):
         gamma_values = np.array([0.0])
         convergence_times = np.array([[0.1]])
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from topological_photonics.dynamics import diamond_gain_loss
+from topological_photonics.dynamics.observables import ObservableRecorder
+from topological_photonics.dynamics.trajectory import iter_evolution
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+
+
+class ObservableTests(unittest.TestCase):
+    def test_observables_of_known_states(self):
+        system = DiamondLatticeSystem(n_cells=3)
+        recorder = ObservableRecorder(system)
+
+        localized = np.zeros(system.N, dtype=complex)
+        localized[0] = 2.0
+        recorder.write(0, 0.0, localized)
+        recorder.write(1, 0.1, np.ones(system.N))
+
+        np.testing.assert_allclose(recorder["norm"], [2.0, np.sqrt(system.N)])
+        np.testing.assert_allclose(recorder["ipr"], [1.0, 1 / system.N])
+        np.testing.assert_allclose(recorder["edge_weight"], [1.0, 6 / system.N])
+        np.testing.assert_allclose(recorder["center_of_mass"], [1.0, (system.N + 1) / 2])
+        np.testing.assert_allclose(recorder["population_A"], [1.0, 4 / system.N])
+        np.testing.assert_allclose(recorder["population_B"] + recorder["population_C"],
+                                   [0.0, 6 / system.N])
+
+    def test_stride_and_growth(self):
+        system = NRSSHLatticeSystem(n_cells=3, v=0.2, u=0.5, r=0.9, gamma1=0.5, gamma2=0.2)
+        sized = ObservableRecorder(system, ["norm", "ipr"], stride=4, n_steps=10)
+        growing = ObservableRecorder(system, {"max": lambda system, phi, intensity: intensity.max()},
+                                     stride=4)
+        growing.times = growing.times[:1]
+        growing.values = {name: values[:1] for name, values in growing.values.items()}
+
+        for step, time, phi in iter_evolution(system, 0.1, 10):
+            sized.write(step, time, phi)
+            growing.write(step, time, phi)
+            if step == 8:
+                expected = np.linalg.norm(phi)
+
+        self.assertEqual(len(sized.times), 3)
+        np.testing.assert_allclose(sized["time"], [0.0, 0.4, 0.8])
+        self.assertAlmostEqual(sized["norm"][-1], expected)
+        self.assertEqual(set(sized.results()), {"time", "norm", "ipr"})
+        np.testing.assert_allclose(growing["time"], sized["time"])
+
+        with self.assertRaises(ValueError):
+            ObservableRecorder(system, ["population_C"])
+
+    def test_final_state_search_feeds_recorder(self):
+        system = DiamondLatticeSystem(n_cells=3, gamma1=0.9, gamma2=0.8)
+        recorder = ObservableRecorder(system, stride=5)
+        final_phi, final_time, _ = diamond_gain_loss.find_and_plot_final_state(
+            system, 1.0, 1.0, 1.0, 1.0, 0.9, 0.8, max_time=2, plot=False, verbose=False, sink=recorder,
+        )
+        self.assertEqual(recorder.count, 5)
+        self.assertAlmostEqual(recorder["time"][-1], final_time)
+        self.assertAlmostEqual(recorder["norm"][-1], np.linalg.norm(final_phi))
+
+
+if __name__ == "__main__":
+    unittest.main()
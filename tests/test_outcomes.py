@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from topological_photonics.phases import nrssh_phase_diagrams
+from topological_photonics.phases.cache import ResultCache
+from topological_photonics.phases.common import find_convergence_time
+from topological_photonics.phases.outcomes import (BLOW_UP, CONVERGED, GROWTH, OSCILLATION, TIME_LIMIT,
+                                                  DivergenceDetector)
+
+
+class DivergenceDetectorTests(unittest.TestCase):
+    def feed(self, detector, intensities):
+        for previous, intensity in zip(intensities[:-1], intensities[1:]):
+            outcome = detector.update(intensity - previous, intensity)
+            if outcome is not None:
+                return outcome
+        return None
+
+    def test_blow_up_is_recognized_immediately(self):
+        detector = DivergenceDetector(1e-2, window=8)
+        self.assertEqual(detector.update(1.0, np.inf), BLOW_UP)
+        self.assertEqual(detector.update(1.0, 2 * DivergenceDetector.BLOW_UP_INTENSITY), BLOW_UP)
+
+    def test_growth_requires_a_steady_exponential_rate(self):
+        time = 0.1 * np.arange(1000)
+        self.assertEqual(self.feed(DivergenceDetector(1e-2, window=100), np.exp(0.2 * time)), GROWTH)
+        # A saturated front spreading through the lattice grows polynomially
+        self.assertIsNone(self.feed(DivergenceDetector(1e-2, window=100), 1 + 5 * time + time ** 2))
+
+    def test_limit_cycle_is_told_apart_from_damped_oscillation(self):
+        steps = np.arange(1000)
+        sustained = 10 + np.sin(steps / 5)
+        damped = 10 + np.sin(steps / 5) * np.exp(-steps / 100)
+        self.assertEqual(self.feed(DivergenceDetector(1e-2, window=200), sustained), OSCILLATION)
+        self.assertIsNone(self.feed(DivergenceDetector(1e-2, window=200), damped))
+
+    def test_short_window_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DivergenceDetector(1e-2, window=4)
+
+
+class EarlyStopTests(unittest.TestCase):
+    kwargs = dict(v=0.3, u=0.5, r=0.7, S=1.0)
+
+    def test_unbounded_amplification_stops_before_the_time_limit(self):
+        system = nrssh_phase_diagrams.build_system(0.5, 0.0, n_cells=40, **self.kwargs)
+        full_time, converged = find_convergence_time(system, max_time=100)
+        time, outcome = find_convergence_time(system, max_time=100, early_stop=True,
+                                              return_outcome=True)
+        self.assertFalse(converged)
+        self.assertEqual(outcome, GROWTH)
+        self.assertLess(time, 0.5 * full_time)
+
+    def test_early_stop_keeps_converged_points(self):
+        kwargs = dict(points=3, max_time=100, plot=False, verbose=False, **self.kwargs)
+        _, _, times, converged_mask = nrssh_phase_diagrams.create_phase_diagram(**kwargs)
+        _, _, early_times, early_mask, outcomes = nrssh_phase_diagrams.create_phase_diagram(
+            early_stop=True, return_outcomes=True, **kwargs
+        )
+
+        np.testing.assert_array_equal(early_mask, converged_mask)
+        np.testing.assert_array_equal(early_mask, outcomes == CONVERGED)
+        np.testing.assert_array_equal(early_times[converged_mask], times[converged_mask])
+        np.testing.assert_array_equal(outcomes[1:, 0], GROWTH)
+
+    def test_default_window_follows_max_time(self):
+        system = nrssh_phase_diagrams.build_system(0.5, 0.0, n_cells=40, **self.kwargs)
+        time, outcome = find_convergence_time(system, max_time=50, early_stop=True, return_outcome=True)
+        self.assertEqual(outcome, GROWTH)
+        self.assertLess(time, 25)
+
+    def test_outcome_codes_survive_the_cache(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ResultCache(os.path.join(tmpdir, "cache.sqlite")) as cache:
+                cache.put_many([("a", 1.0, OSCILLATION), ("b", 2.0, False)])
+                self.assertEqual(cache.get_many(["a", "b"]),
+                                 {"a": (1.0, OSCILLATION), "b": (2.0, TIME_LIMIT)})
+
+            with ResultCache(os.path.join(tmpdir, "cache.sqlite")) as cache:
+                self.assertEqual(cache.get_many(["a"]), {"a": (1.0, OSCILLATION)})
+
+
+if __name__ == "__main__":
+    unittest.main()
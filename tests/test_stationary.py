@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from topological_photonics.dynamics import diamond_gain_loss
+from topological_photonics.dynamics.stationary import find_stationary_state
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+
+
+class StationaryStateTests(unittest.TestCase):
+    def test_diamond_stationary_mode_matches_time_marched_final_state(self):
+        system = DiamondLatticeSystem(n_cells=5, t1=0.9, t2=0.5, t3=0.5, t4=0.9,
+                                      gamma1=0.9, gamma2=0.5)
+
+        phi, energy, iterations, converged = find_stationary_state(system)
+        final_phi, _, final_converged = diamond_gain_loss.find_and_plot_final_state(
+            system, 0.9, 0.5, 0.5, 0.9, 0.9, 0.5, tolerance=1e-9, max_time=500,
+            plot=False, verbose=False,
+        )
+
+        self.assertTrue(converged)
+        self.assertTrue(final_converged)
+        self.assertGreater(iterations, 0)
+        self.assertIsInstance(energy, float)
+        np.testing.assert_allclose(np.abs(phi) ** 2, np.abs(final_phi) ** 2, atol=1e-5)
+
+    def test_nrssh_stationary_mode_solves_nonlinear_eigenproblem(self):
+        system = NRSSHLatticeSystem(n_cells=6, v=0.2, u=0.5, r=0.9, gamma1=0.5, gamma2=0.2)
+
+        phi, energy, _, converged = find_stationary_state(system)
+        H = system.get_hamiltonian(phi)
+
+        self.assertTrue(converged)
+        self.assertGreater(np.linalg.norm(phi), 0)
+        np.testing.assert_allclose(H @ phi, energy * phi, atol=1e-9)
+
+    def test_above_threshold_search_never_reports_the_zero_state_as_converged(self):
+        system = DiamondLatticeSystem(n_cells=15, t1=0.9, t2=0.5, t3=0.5, t4=0.9,
+                                      gamma1=0.9, gamma2=0.3)
+
+        phi, energy, _, converged = find_stationary_state(system)
+
+        self.assertGreater(np.linalg.norm(phi), 1e-3 * 12.0)
+        if converged:
+            np.testing.assert_allclose(system.get_hamiltonian(phi) @ phi, energy * phi,
+                                       atol=1e-8 * np.linalg.norm(phi))
+
+    def test_below_threshold_stationary_state_is_zero(self):
+        system = NRSSHLatticeSystem(n_cells=3, v=0.2, u=0.5, r=0.9, gamma1=0.1, gamma2=0.8)
+
+        phi, _, iterations, converged = find_stationary_state(system)
+
+        self.assertTrue(converged)
+        self.assertEqual(iterations, 0)
+        np.testing.assert_array_equal(phi, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,320 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.linalg import expm
+
+from topological_photonics.dynamics import diamond_gain_loss
+from topological_photonics.dynamics.stepping import AdaptiveStepper, StateHistory
+from topological_photonics.models.common import saturable_gain_loss_flow
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+from topological_photonics.phases import diamond_phase_diagrams, nrssh_phase_diagrams
+from topological_photonics.phases.common import find_convergence_time
+
+
+class AdaptiveSteppingTests(unittest.TestCase):
+    def test_adaptive_steps_track_the_exact_linear_evolution(self):
+        system = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.0, gamma2=0.2)
+        phi0 = np.zeros(system.N, dtype=complex)
+        phi0[0] = 1.0
+
+        stepper = AdaptiveStepper(system, 0.1, rtol=1e-6, atol=1e-10)
+        phi, time = phi0, 0.0
+        while time < 2.0:
+            phi, h = stepper.step(phi, max_step=2.0 - time)
+            time += h
+
+        exact = expm(-2.0j * system.get_hamiltonian(phi0)) @ phi0
+
+        self.assertAlmostEqual(time, 2.0)
+        self.assertGreater(stepper.accepted, 0)
+        np.testing.assert_allclose(phi, exact, atol=1e-4)
+
+    def test_adaptive_cayley_steps_meet_the_local_tolerance(self):
+        rtol, atol = 1e-6, 1e-10
+        system = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2)
+        reference_system = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2,
+                                              backend="dense", method="yoshida")
+        self.assertEqual(system.order, 1)
+
+        stepper = AdaptiveStepper(system, 0.1, rtol=rtol, atol=atol)
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+        for _ in range(20):
+            phi_new, h = stepper.step(phi)
+            exact = phi
+            for _ in range(20):
+                exact = reference_system.step(exact, h / 20)
+            error = np.linalg.norm(phi_new - exact)
+            self.assertLess(error, atol + rtol * np.linalg.norm(exact))
+            phi = phi_new
+
+    def test_adaptive_trial_steps_reuse_one_stepper_per_step_size(self):
+        system = DiamondLatticeSystem(n_cells=15, t1=0.5, t2=0.1, t3=0.1, t4=0.5,
+                                      gamma1=0.9, gamma2=0.1)
+        built = []
+        stepper_of = system.stepper
+        system.stepper = lambda dt, **options: built.append(dt) or stepper_of(dt, **options)
+
+        stepper = AdaptiveStepper(system, 0.1)
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+        sizes = set()
+        for _ in range(200):
+            phi, h = stepper.step(phi)
+            sizes.add(h)
+
+        levels = [stepper.LEVELS_PER_OCTAVE * np.log2(h / 0.1) for h in sizes]
+        np.testing.assert_allclose(levels, np.round(levels), atol=1e-9)
+        # Each attempt takes three trial steps, but steppers are only built for new step sizes
+        self.assertLess(len(built), (stepper.accepted + stepper.rejected) // 4)
+        self.assertLessEqual(len(stepper.steppers), system.LINEAR_CACHE_SIZE)
+
+    def test_adaptive_convergence_time_is_reported_in_physical_time(self):
+        system = DiamondLatticeSystem(n_cells=5, t1=0.5, t2=0.1, t3=0.1, t4=0.5,
+                                      gamma1=0.6, gamma2=0.3)
+
+        fixed_time, fixed_converged = find_convergence_time(system, max_time=75)
+        adaptive_time, adaptive_converged = find_convergence_time(system, max_time=75, adaptive=True)
+
+        self.assertTrue(fixed_converged)
+        self.assertTrue(adaptive_converged)
+        self.assertAlmostEqual(adaptive_time, fixed_time, delta=0.1 * fixed_time)
+
+    def test_adaptive_evolution_stops_at_max_time(self):
+        system = DiamondLatticeSystem(n_cells=2, gamma1=0.9, gamma2=0.1, S=0.0)
+
+        time, converged = find_convergence_time(system, max_time=3, adaptive=True)
+        final_phi, final_time, final_converged = diamond_gain_loss.find_and_plot_final_state(
+            system, 1.0, 1.0, 1.0, 1.0, 0.9, 0.1, max_time=3, plot=False, verbose=False,
+            adaptive=True,
+        )
+
+        self.assertFalse(converged)
+        self.assertAlmostEqual(time, 3)
+        self.assertAlmostEqual(final_time, 3)
+        self.assertFalse(final_converged)
+        self.assertTrue(np.all(np.isfinite(final_phi)))
+
+    def test_adaptive_phase_grid_runs(self):
+        _, _, times, converged = nrssh_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=1, plot=False, verbose=False, adaptive=True,
+        )
+
+        self.assertTrue(np.all(times <= 1 + 1e-9))
+
+        with self.assertRaises(ValueError):
+            nrssh_phase_diagrams.create_phase_diagram(
+                points=2, n_cells=2, max_time=1, plot=False, verbose=False, adaptive=True,
+                batched=True,
+            )
+
+
+def evolve(system, dt, total_time):
+    phi = np.zeros(system.N, dtype=complex)
+    phi[0] = 1.0
+    for _ in range(int(round(total_time / dt))):
+        phi = system.step(phi, dt)
+    return phi
+
+
+class KrylovIntegratorTests(unittest.TestCase):
+    def test_krylov_step_is_exact_for_linear_evolution(self):
+        for backend in ("dense", "banded", "sparse"):
+            system = DiamondLatticeSystem(n_cells=20, gamma1=0.0, gamma2=0.2, backend=backend,
+                                          method="krylov")
+            phi0 = np.zeros(system.N, dtype=complex)
+            phi0[0] = 1.0
+
+            H = DiamondLatticeSystem(n_cells=20, gamma1=0.0, gamma2=0.2).get_hamiltonian(phi0)
+            np.testing.assert_allclose(system.step(phi0, 1.0), expm(-1.0j * H) @ phi0, atol=1e-9)
+
+    def test_krylov_integrator_is_second_order_with_saturable_gain(self):
+        def system(**options):
+            return NRSSHLatticeSystem(n_cells=10, v=0.2, u=0.5, r=0.9, gamma1=0.6, gamma2=0.2,
+                                      **options)
+
+        reference = evolve(system(method="krylov"), 0.0125, 3.0)
+        coarse = np.max(np.abs(evolve(system(method="krylov"), 0.2, 3.0) - reference))
+        fine = np.max(np.abs(evolve(system(method="krylov"), 0.1, 3.0) - reference))
+        cayley = np.max(np.abs(evolve(system(), 0.1, 3.0) - reference))
+
+        self.assertGreater(coarse / fine, 3.0)
+        self.assertLess(fine, cayley)
+
+    def test_krylov_method_runs_phase_grids_but_not_batched_ones(self):
+        serial = nrssh_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=2, plot=False, verbose=False, method="krylov",
+        )
+        self.assertEqual(serial[2].shape, (2, 2))
+
+        with self.assertRaises(ValueError):
+            nrssh_phase_diagrams.create_phase_diagram(
+                points=2, n_cells=2, max_time=2, plot=False, verbose=False, method="krylov",
+                batched=True,
+            )
+
+    def test_invalid_method_is_rejected(self):
+        with self.assertRaises(ValueError):
+            NRSSHLatticeSystem(n_cells=2, method="euler")
+
+
+class SplitStepTests(unittest.TestCase):
+    def test_gain_loss_flow_matches_direct_integration(self):
+        phi = np.array([0.01, 0.3 + 0.4j, 2.0j, 5.0, 0.0])
+        for gain, loss, S in [(0.6, 0.2, 1.0), (0.6, 0.0, 1.0), (0.3, 0.3, 2.0), (0.0, 0.5, 1.0)]:
+            for dt in (0.5, -0.3):
+                flowed = saturable_gain_loss_flow(gain, loss, S, phi, dt)
+                for start, end in zip(phi, flowed):
+                    solution = solve_ivp(lambda t, I: 2 * (gain / (1 + S * I) - loss) * I,
+                                         (0, dt), [abs(start) ** 2], rtol=1e-12, atol=1e-14)
+                    self.assertAlmostEqual(abs(end) ** 2, solution.y[0, -1], places=9)
+                    if start != 0:
+                        self.assertAlmostEqual(np.angle(end), np.angle(start))
+
+    def test_split_steps_converge_at_their_order(self):
+        for model, options in [(NRSSHLatticeSystem, dict(n_cells=10, v=0.2, u=0.5, r=0.9)),
+                               (DiamondLatticeSystem, dict(n_cells=10))]:
+            def system(method, backend="banded"):
+                return model(gamma1=0.6, gamma2=0.2, method=method, backend=backend, **options)
+
+            reference = evolve(system("yoshida", "dense"), 0.01, 3.0)
+            for method, order in (("strang", 2), ("yoshida", 4)):
+                for backend in ("dense", "banded"):
+                    coarse = np.max(np.abs(evolve(system(method, backend), 0.2, 3.0) - reference))
+                    fine = np.max(np.abs(evolve(system(method, backend), 0.1, 3.0) - reference))
+                    self.assertGreater(coarse / fine, 0.8 * 2 ** order, (model, method, backend))
+
+    def test_adaptive_dense_split_steps_keep_a_bounded_propagator_cache(self):
+        system = NRSSHLatticeSystem(n_cells=50, gamma1=0.6, gamma2=0.2, backend="dense",
+                                    method="yoshida")
+        stepper = AdaptiveStepper(system, 0.1)
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+        time = 0.0
+        # Sites the wave has not reached yet have vanishing intensity, which must not overflow
+        with np.errstate(over="raise"):
+            while time < 20.0:
+                phi, h = stepper.step(phi, max_step=20.0 - time)
+                time += h
+
+        self.assertGreater(stepper.accepted + stepper.rejected, system.LINEAR_CACHE_SIZE)
+        self.assertLessEqual(len(system._hopping_propagators), system.LINEAR_CACHE_SIZE)
+
+    def test_split_step_phase_grid_runs(self):
+        grid = nrssh_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=2, plot=False, verbose=False, method="strang",
+        )
+        self.assertEqual(grid[2].shape, (2, 2))
+
+
+class ImplicitMidpointTests(unittest.TestCase):
+    def system(self, method, backend="banded", model=DiamondLatticeSystem, **options):
+        return model(n_cells=10, gamma1=0.6, gamma2=0.2, method=method, backend=backend, **options)
+
+    def test_midpoint_is_second_order(self):
+        for model, options in [(NRSSHLatticeSystem, dict(v=0.2, u=0.5, r=0.9)), (DiamondLatticeSystem, {})]:
+            reference = evolve(self.system("yoshida", "dense", model, **options), 0.01, 3.0)
+            errors = {}
+            for method in ("cayley", "midpoint"):
+                for dt in (0.1, 0.05):
+                    system = self.system(method, model=model, **options)
+                    errors[method, dt] = np.max(np.abs(evolve(system, dt, 3.0) - reference))
+            # the explicit gain term makes the plain Cayley step first order
+            self.assertLess(errors["cayley", 0.1] / errors["cayley", 0.05], 2.5, model)
+            self.assertGreater(errors["midpoint", 0.1] / errors["midpoint", 0.05], 3.5, model)
+            self.assertLess(errors["midpoint", 0.05], errors["cayley", 0.05], model)
+
+    def test_backends_agree(self):
+        results = [evolve(self.system("midpoint", backend), 0.1, 2.0)
+                   for backend in ("dense", "banded", "sparse")]
+        np.testing.assert_allclose(results[1], results[0], atol=1e-10)
+        np.testing.assert_allclose(results[2], results[0], atol=1e-10)
+
+    def test_without_corrections_matches_cayley(self):
+        system = self.system("midpoint")
+        system.implicit_max_iterations = 0
+        np.testing.assert_allclose(evolve(system, 0.1, 2.0), evolve(self.system("cayley"), 0.1, 2.0))
+
+    def test_midpoint_phase_grid_runs(self):
+        grid = diamond_phase_diagrams.create_phase_diagram(
+            points=2, n_cells=2, max_time=2, plot=False, verbose=False, method="midpoint",
+        )
+        self.assertEqual(grid[2].shape, (2, 2))
+
+
+class StepperTests(unittest.TestCase):
+    def test_stepper_matches_step(self):
+        for model in (NRSSHLatticeSystem, DiamondLatticeSystem):
+            for backend in ("dense", "banded", "sparse"):
+                for method in ("cayley", "midpoint", "strang"):
+                    for gamma1 in (0.6, 0.0):
+                        system = model(n_cells=4, gamma1=gamma1, gamma2=0.2, backend=backend,
+                                       method=method)
+                        stepper = system.stepper(0.1, onsite=0.05)
+                        phi = np.zeros(system.N, dtype=complex)
+                        phi[0] = 1.0
+                        state = phi.copy()
+                        for _ in range(20):
+                            phi = system.step(phi, 0.1, onsite=0.05)
+                            self.assertIs(stepper.step(state), state)
+                        np.testing.assert_allclose(state, phi, atol=1e-13,
+                                                   err_msg=f"{model.__name__} {backend} {method} {gamma1}")
+
+    def test_out_leaves_input_unchanged(self):
+        system = DiamondLatticeSystem(n_cells=4, gamma1=0.6, gamma2=0.2)
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+        out = np.empty_like(phi)
+        system.stepper(0.1).step(phi, out=out)
+        self.assertEqual(phi[0], 1.0)
+        np.testing.assert_allclose(out, system.step(phi, 0.1), atol=1e-14)
+
+    def test_banded_step_allocates_no_state_sized_arrays(self):
+        for model in (NRSSHLatticeSystem, DiamondLatticeSystem):
+            system = model(n_cells=2000, gamma1=0.6, gamma2=0.2)
+            stepper = system.stepper(0.1)
+            phi = np.ones(system.N, dtype=complex)
+            stepper.step(phi)
+
+            tracemalloc.start()
+            stepper.step(phi)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            # only LAPACK's integer pivot array remains
+            self.assertLess(peak, 4 * system.N + 1024, model)
+
+
+class StateHistoryTests(unittest.TestCase):
+    def test_keeps_only_the_most_recent_states(self):
+        history = StateHistory(3, 2)
+        for k in range(5):
+            history.push(np.full(2, k, dtype=complex), 0.1 * k)
+
+        states, times = history.newest_first()
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history.states.shape, (3, 2))
+        np.testing.assert_array_equal(states[:, 0], [4, 3, 2])
+        np.testing.assert_allclose(times, [0.4, 0.3, 0.2])
+
+        with self.assertRaises(ValueError):
+            StateHistory(0, 2)
+
+    def test_final_state_plot_uses_the_forward_trajectory(self):
+        system = DiamondLatticeSystem(n_cells=3, gamma1=0.9, gamma2=0.8)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            final_phi, final_time, _ = diamond_gain_loss.find_and_plot_final_state(
+                system, 1.0, 1.0, 1.0, 1.0, 0.9, 0.8, max_time=2, n_backtrack=60, verbose=False,
+                output_dir=tmpdir,
+            )
+            self.assertEqual(len(os.listdir(os.path.join(tmpdir, "intensities"))), 1)
+
+        np.testing.assert_allclose(final_phi, evolve(system, 0.1, final_time))
+
+
+if __name__ == "__main__":
+    unittest.main()
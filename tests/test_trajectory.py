@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from itertools import islice
+
+import numpy as np
+
+from topological_photonics.dynamics import nrssh_time_evolution
+from topological_photonics.dynamics.trajectory import TrajectorySink, iter_evolution, record_trajectory
+from topological_photonics.instrumentation import StepProfiler
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+
+
+class TrajectoryTests(unittest.TestCase):
+    def setUp(self):
+        self.system = NRSSHLatticeSystem(n_cells=4, v=0.2, u=0.5, r=0.9, gamma1=0.5, gamma2=0.2)
+
+    def test_generator_matches_explicit_steps(self):
+        phi = np.zeros(self.system.N, dtype=complex)
+        phi[0] = 1.0
+        for step, time, state in iter_evolution(self.system, 0.1, 5):
+            self.assertAlmostEqual(time, 0.1 * step)
+            np.testing.assert_allclose(state, phi, atol=1e-14)
+            phi = self.system.step(phi, 0.1)
+        self.assertEqual(step, 5)
+
+    def test_unbounded_generator_records_partial_run(self):
+        profiler = StepProfiler()
+        evolution = iter_evolution(self.system, 0.1, profiler=profiler)
+        self.assertEqual([step for step, _, _ in islice(evolution, 4)], [0, 1, 2, 3])
+        evolution.close()
+        self.assertEqual(profiler.steps, 3)
+        self.assertEqual(len(profiler.runs), 1)
+
+    def test_recorded_trajectory_keeps_every_stride_step(self):
+        states = [phi.copy() for _, _, phi in iter_evolution(self.system, 0.1, 10)]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trajectory.npy")
+            final_phi, times = record_trajectory(self.system, 0.1, 10, path, stride=3)
+            stored = np.load(path, mmap_mode="r")
+
+            self.assertEqual(stored.dtype, np.complex64)
+            self.assertEqual(stored.shape, (4, self.system.N))
+            np.testing.assert_allclose(times, [0.0, 0.3, 0.6, 0.9])
+            np.testing.assert_allclose(stored, states[::3], atol=1e-6)
+            np.testing.assert_array_equal(final_phi, states[-1])
+            del stored
+
+    def test_sink_rejects_extra_states(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with TrajectorySink(os.path.join(tmpdir, "trajectory.npy"), 2, 1) as sink:
+                sink.write(0, 0.0, np.ones(2))
+                sink.write(1, 0.1, np.ones(2))
+                with self.assertRaises(ValueError):
+                    sink.write(2, 0.2, np.ones(2))
+
+    def test_evolve_and_plot_feeds_sink(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trajectory.npy")
+            with TrajectorySink(path, self.system.N, 10, stride=5) as sink:
+                final_phi = nrssh_time_evolution.evolve_and_plot(self.system, 0.1, 1.0, verbose=False,
+                                                                 output_dir=tmpdir, sink=sink)
+            self.assertEqual(sink.count, 3)
+            np.testing.assert_allclose(np.load(path)[-1], final_phi, atol=1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
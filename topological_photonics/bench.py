@@ -0,0 +1,269 @@
+"""
+Benchmarks for the steppers, spectra and phase-grid entry points.
+
+Run with
+
+    python -m topological_photonics.bench --output results.json
+    python -m topological_photonics.bench --baseline results.json
+
+Results are written as JSON together with machine information. When a
+baseline file is given, every case that got slower by more than the
+threshold is reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
+import scipy
+
+from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
+from topological_photonics.models.nrssh_lattice import NRSSHLatticeSystem
+from topological_photonics.phases import diamond_phase_diagrams, nrssh_phase_diagrams
+from topological_photonics.phases.common import create_phase_grid, find_convergence_time
+
+MODELS = {
+    "nrssh": (partial(NRSSHLatticeSystem, v=0.5, u=0.5, r=0.5, S=5.0),
+              partial(nrssh_phase_diagrams.build_system, v=0.5, u=0.5, r=0.5, S=5.0)),
+    "diamond": (partial(DiamondLatticeSystem, t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0),
+                partial(diamond_phase_diagrams.build_system, t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0)),
+}
+
+SIZES = {
+    "full": {"operator": [10, 40, 80], "step": [10, 100, 1000], "spectrum": [10, 40, 80],
+             "convergence": [10, 40], "grid": [4, 8]},
+    "quick": {"operator": [10], "step": [10, 100], "spectrum": [10],
+              "convergence": [10], "grid": [3]},
+}
+
+
+def _initial_state(system):
+    return np.ones(system.N, dtype=complex) / np.sqrt(system.N)
+
+
+def _operator_case(make_system, n_cells):
+    system = make_system(n_cells=n_cells, gamma1=0.5, gamma2=0.2, backend="dense")
+    H = system.get_hamiltonian(_initial_state(system))
+    return lambda: system.time_evolution_operator(H, 0.1)
+
+
+def _step_case(make_system, n_cells, backend):
+    system = make_system(n_cells=n_cells, gamma1=0.5, gamma2=0.2, backend=backend)
+    phi = _initial_state(system)
+    system.step(phi, 0.1)  # build cached operators outside the timed region
+    return lambda: system.step(phi, 0.1)
+
+
+def _stepper_case(make_system, n_cells, backend):
+    system = make_system(n_cells=n_cells, gamma1=0.5, gamma2=0.2, backend=backend)
+    phi = _initial_state(system)
+    stepper = system.stepper(0.1)
+    return lambda: stepper.step(phi)
+
+
+def _spectrum_case(make_system, n_cells):
+    system = make_system(n_cells=n_cells, gamma1=0.5, gamma2=0.2, backend="dense")
+    H = system.get_hamiltonian(np.zeros(system.N))
+    return lambda: np.linalg.eigvals(H)
+
+
+def _convergence_case(make_system, n_cells):
+    return lambda: find_convergence_time(
+        make_system(n_cells=n_cells, gamma1=0.5, gamma2=0.2), max_time=20
+    )
+
+
+def _grid_case(build_system, points, batched):
+    factory = partial(build_system, n_cells=5)
+    return lambda: create_phase_grid(points, factory, "", 0.1, 1e-2, 20, False, batched=batched)
+
+
+def benchmark_cases(quick=False):
+    """
+    Build the benchmark cases as (name, setup) pairs.
+
+    Each setup returns the callable to time, so building systems and
+    Hamiltonians is not counted.
+    """
+    sizes = SIZES["quick" if quick else "full"]
+    cases = []
+
+    for model, (make_system, build_system) in MODELS.items():
+        for n_cells in sizes["operator"]:
+            cases.append((f"{model}/time_evolution_operator/n_cells={n_cells}",
+                          partial(_operator_case, make_system, n_cells)))
+        for backend in ("dense", "banded", "sparse"):
+            for n_cells in sizes["step"]:
+                if backend == "dense" and n_cells > max(sizes["operator"]):
+                    continue
+                cases.append((f"{model}/step/{backend}/n_cells={n_cells}",
+                              partial(_step_case, make_system, n_cells, backend)))
+                cases.append((f"{model}/stepper/{backend}/n_cells={n_cells}",
+                              partial(_stepper_case, make_system, n_cells, backend)))
+        for n_cells in sizes["spectrum"]:
+            cases.append((f"{model}/spectrum/n_cells={n_cells}",
+                          partial(_spectrum_case, make_system, n_cells)))
+        for n_cells in sizes["convergence"]:
+            cases.append((f"{model}/find_convergence_time/n_cells={n_cells}",
+                          partial(_convergence_case, make_system, n_cells)))
+        for points in sizes["grid"]:
+            for batched in (False, True):
+                mode = "batched" if batched else "serial"
+                cases.append((f"{model}/create_phase_grid/{mode}/points={points}",
+                              partial(_grid_case, build_system, points, batched)))
+
+    return cases
+
+
+def time_case(setup, repeat=5, min_time=0.05):
+    """
+    Time one benchmark case.
+
+    The callable is run in a loop until a single measurement takes at least
+    min_time seconds, and that measurement is repeated `repeat` times.
+
+    Returns:
+    --------
+    timing : dict
+        Best and median seconds per call, and the number of calls per measurement
+    """
+    function = setup()
+    function()  # warm-up
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) / number)
+
+    return {"best": min(samples), "median": statistics.median(samples), "number": number}
+
+
+def machine_info():
+    """
+    Describe the machine and library versions the benchmarks ran on.
+    """
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+    }
+
+
+def run_benchmarks(quick=False, repeat=5, min_time=0.05, match=None, verbose=True):
+    """
+    Run the benchmark suite.
+
+    Parameters:
+    -----------
+    quick : bool
+        Whether to use the small problem sizes
+    repeat : int
+        Number of measurements per case
+    min_time : float
+        Minimum duration of one measurement in seconds
+    match : str, optional
+        Only run cases whose name contains this string
+    verbose : bool
+        Whether to print each result as it finishes
+
+    Returns:
+    --------
+    report : dict
+        Machine information, a timestamp and the timings keyed by case name
+    """
+    results = {}
+    for name, setup in benchmark_cases(quick=quick):
+        if match is not None and match not in name:
+            continue
+        results[name] = time_case(setup, repeat=repeat, min_time=min_time)
+        if verbose:
+            print(f"{name:60s} {results[name]['best'] * 1e3:12.4f} ms")
+
+    return {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": machine_info(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(report, baseline, threshold=0.2):
+    """
+    Find cases that are slower than in a baseline report.
+
+    Best times are compared, since they are the least sensitive to noise.
+    Cases missing from either report are ignored.
+
+    Returns:
+    --------
+    regressions : list of tuple
+        (name, baseline seconds, current seconds, ratio) for every case whose
+        ratio exceeds 1 + threshold
+    """
+    regressions = []
+    for name, timing in report["results"].items():
+        if name not in baseline["results"]:
+            continue
+        reference = baseline["results"][name]["best"]
+        ratio = timing["best"] / reference if reference > 0 else float("inf")
+        if ratio > 1 + threshold:
+            regressions.append((name, reference, timing["best"], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m topological_photonics.bench",
+        description="Time the steppers, spectra and phase-grid entry points.",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="compare against a previously written JSON report")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative slowdown flagged as a regression (default: 0.2)")
+    parser.add_argument("--quick", action="store_true", help="only run the small problem sizes")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per case (default: 5)")
+    parser.add_argument("--match", help="only run cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(quick=args.quick, repeat=args.repeat, match=args.match)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare_to_baseline(report, baseline, threshold=args.threshold)
+        for name, reference, current, ratio in regressions:
+            print(f"REGRESSION {name}: {reference * 1e3:.4f} ms -> {current * 1e3:.4f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,13 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from topological_photonics.dynamics.stepping import AdaptiveStepper, StateHistory
+from topological_photonics.instrumentation import section
 from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
-from topological_photonics.plotting import output_file
+from topological_photonics.plotting import output_file, pyplot
 
 
 def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=0.1, tolerance=1e-3, max_time=50, n_backtrack=50,
-                              plot=True, verbose=True, output_dir="outputs"):
+                              plot=True, verbose=True, output_dir="outputs", adaptive=False, rtol=1e-4, atol=1e-8,
+                              profiler=None, sink=None):
     """
     Find the final state of the system and plot the evolution leading to it.
 
@@ -20,11 +22,19 @@ def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=
     max_time : float
         Maximum evolution time
     n_backtrack : int
-        Number of states to plot by backtracking
+        Number of final states to plot, kept in a ring buffer during the evolution
     plot : bool
         Whether to create the plot
     verbose : bool
         Whether to print evolution information
+    adaptive : bool
+        Whether to use error-controlled step sizes starting from dt
+    rtol, atol : float
+        Relative and absolute local error tolerances for adaptive stepping
+    profiler : StepProfiler, optional
+        Collector for the time spent in each part of every step
+    sink : ObservableRecorder or TrajectorySink, optional
+        Receives every accepted state of the evolution
 
     Returns:
     --------
@@ -52,24 +62,42 @@ def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=
         print(f"  tolerance: {tolerance}")
         print(f"  max_time: {max_time}")
 
+    if adaptive:
+        stepper = AdaptiveStepper(system, dt, rtol=rtol, atol=atol, profiler=profiler)
+    else:
+        stepper = system.stepper(dt, profiler=profiler)
+
+    # The last n_backtrack states of the trajectory, for the plot
+    history = StateHistory(n_backtrack, N) if plot else None
+    if history is not None:
+        history.push(phi, time)
+    if sink is not None:
+        sink.write(0, time, phi)
+
     # Evolve until convergence or max time
+    intensity = np.vdot(phi, phi).real
     step_count = 0
     while dif >= tolerance:
-        # Get current Hamiltonian with nonlinear terms
-        H = system.get_hamiltonian(phi, onsite=0.0)
-
-        # Get time evolution operator
-        U_op = system.time_evolution_operator(H, dt)
-
-        # Evolve the wavefunction
-        phi_new = np.dot(U_op, phi)
-
-        # Check convergence (difference in intensity)
-        dif = abs(sum(np.abs(phi_new) ** 2) - sum(np.abs(phi) ** 2))
-
-        phi = phi_new
-        time += dt
+        # Evolve the wavefunction with the current nonlinear terms (in place for fixed steps)
+        if adaptive:
+            phi, h = stepper.step(phi, max_step=max_time - time)
+        else:
+            phi, h = stepper.step(phi), dt
+
+        # Check convergence (difference in intensity, rescaled to a step of length dt)
+        with section(profiler, "convergence"):
+            new_intensity = np.vdot(phi, phi).real
+            dif = abs(new_intensity - intensity)
+            intensity = new_intensity
+            if adaptive:
+                dif *= dt / h
+
+        time += h
         step_count += 1
+        if history is not None:
+            history.push(phi, time)
+        if sink is not None:
+            sink.write(step_count, time, phi)
 
         # Print progress occasionally
         if verbose and step_count % 1000 == 0:
@@ -85,37 +113,36 @@ def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=
         if verbose:
             print(f"  Converged at time = {time:.4f} after {step_count} steps")
 
+    if verbose and adaptive:
+        print(f"  Adaptive steps: {stepper.accepted} accepted, {stepper.rejected} rejected")
+
+    if profiler is not None:
+        profiler.count_step(step_count)
+        profiler.record_run(step_count, time, phi, converged)
+
     final_phi = phi.copy()
     final_time = time
 
     if plot:
-        # Set up color mapping for backtracking plot
-        values = np.linspace(1, n_backtrack)
+        plt = pyplot()
+
+        states, times = history.newest_first()
+
+        # Set up color mapping for the stored states
+        values = np.linspace(1, n_backtrack, n_backtrack)
         normalized_values = values / n_backtrack
         colormap = plt.colormaps.get_cmap('cool')  # Light blue to hot pink
         colors = colormap(normalized_values)
         plt.figure(figsize=(12, 8))
 
-        # Plot the states leading up to the final by evolving backwards
-        phi_plot = final_phi.copy()
-        for i in range(n_backtrack):
+        # Plot the states leading up to the final one, newest first
+        for i, state in enumerate(states):
             color_index = n_backtrack - 1 - i
             zorder = n_backtrack - i  # Earlier states in back
 
-            plt.plot(x, np.abs(phi_plot) ** 2, c=colors[color_index],
+            plt.plot(x, np.abs(state) ** 2, c=colors[color_index],
                      zorder=zorder, alpha=0.8)
 
-            # Evolve backwards (skip on last iteration)
-            if i < n_backtrack - 1:
-                H = system.get_hamiltonian(phi_plot, onsite=0.0)
-                U_op = system.time_evolution_operator(H, dt)
-                try:
-                    phi_plot = np.dot(np.linalg.inv(U_op), phi_plot)
-                except np.linalg.LinAlgError:
-                    if verbose:
-                        print(f"Warning: Could not invert U at step {i}, stopping backtrack")
-                    break
-
         # Formatting
         plt.xlabel('Site-Index')
         plt.ylabel('Intensity')
@@ -132,7 +159,7 @@ def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=
             plt.Line2D([0], [0], color='#FF00FF',
                        label=f'Final time = {round(final_time, 2)}'),
             plt.Line2D([0], [0], color='#00FFFF',
-                       label=f'{round(final_time - n_backtrack * dt, 2)}')
+                       label=f'{round(times[-1], 2)}')
         ]
         plt.legend(handles=legend_elements)
 
@@ -153,7 +180,8 @@ def find_and_plot_final_state(system, t1, t2, t3, t4, gamma1, gamma2, S=1.0, dt=
 
 
 def plot_example_final_state(n_cells=15, t1=0.9, t2=0.5, t3=0.5, t4=0.9, gamma1=0.9, gamma2=0.8, S=1.0,
-                             dt=0.1, tolerance=1e-3, max_time=100, verbose=True, output_dir="outputs"):
+                             dt=0.1, tolerance=1e-3, max_time=100, verbose=True, output_dir="outputs",
+                             backend="banded", method="cayley"):
     """
     Plot an example final state evolution of the Diamond system.
 
@@ -175,7 +203,9 @@ def plot_example_final_state(n_cells=15, t1=0.9, t2=0.5, t3=0.5, t4=0.9, gamma1=
         t4=t4,  # A and C inter-cell hopping strength
         gamma1=gamma1,  # Gain coefficient (0, 1]
         gamma2=gamma2,  # Loss coefficient (0, 1]
-        S=S  # Saturation constant (>= 0)
+        S=S,  # Saturation constant (>= 0)
+        backend=backend,  # Stepping backend
+        method=method  # Time integrator
     )
 
     if verbose:
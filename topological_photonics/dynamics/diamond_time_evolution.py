@@ -1,10 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from topological_photonics.dynamics.trajectory import iter_evolution
 from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
-from topological_photonics.plotting import output_file
+from topological_photonics.plotting import output_file, pyplot
 
 
-def evolve_and_plot(system, dt, total_time, plot_interval=None, verbose=True, output_dir="outputs"):
+def evolve_and_plot(system, dt, total_time, plot_interval=None, verbose=True, output_dir="outputs",
+                    profiler=None, sink=None):
     """
     Evolve the system and save the wavefunction intensity plot over time.
 
@@ -20,10 +21,17 @@ def evolve_and_plot(system, dt, total_time, plot_interval=None, verbose=True, ou
         Plot every nth step (if None, plots based on available colors)
     verbose : bool
         Whether to print save path
+    profiler : StepProfiler, optional
+        Collector for the time spent in each part of every step
+    sink : ObservableRecorder or TrajectorySink, optional
+        Receives every state of the evolution, e.g. to record observables or
+        write the trajectory to disk
     """
     N = system.N
     x = np.linspace(1, N, N)  # Mimics real-space
 
+    plt = pyplot()
+
     # Color mapping setup
     n_colors = 50
     values = np.linspace(1, n_colors)
@@ -31,33 +39,25 @@ def evolve_and_plot(system, dt, total_time, plot_interval=None, verbose=True, ou
     colormap = plt.colormaps.get_cmap('cool')  # Light blue to hot pink
     colors = colormap(normalized_values)
 
-    # Initialize wavefunction - starts entirely on the first site
-    phi = np.zeros(N, dtype=complex)
-    phi[0] = 1.0
-
     # Time evolution parameters
     n_steps = int(total_time / dt)
     if plot_interval is None:
         plot_interval = max(1, n_steps // n_colors)
 
-    time = 0.0
     color_index = 0
 
     plt.figure(figsize=(12, 8))
 
-    for step in range(n_steps + 1):
+    # The evolution starts entirely on the first site
+    for step, time, phi in iter_evolution(system, dt, n_steps, profiler=profiler):
+        if sink is not None:
+            sink.write(step, time, phi)
+
         # Plot at specified intervals
         if step % plot_interval == 0 and color_index < len(colors):
             plt.plot(x, np.abs(phi) ** 2, c=colors[color_index], alpha=0.8)
             color_index += 1
 
-        # Evolve the system (skip on last step)
-        if step < n_steps:
-            H = system.get_hamiltonian(phi, onsite=0.0)
-            U_op = system.time_evolution_operator(H, dt)
-            phi = np.dot(U_op, phi)
-            time += dt
-
     # Formatting and legend
     plt.xlabel('Site-Index')
     plt.ylabel('Intensity')
@@ -86,7 +86,8 @@ def evolve_and_plot(system, dt, total_time, plot_interval=None, verbose=True, ou
 
 
 def plot_example_evolution(n_cells=15, t1=0.1, t2=0.4, t3=0.7, t4=0.3, gamma1=0.6, gamma2=0.5, S=1.0,
-                           dt=0.1, total_time=None, verbose=True, output_dir="outputs"):
+                           dt=0.1, total_time=None, verbose=True, output_dir="outputs",
+                           backend="banded", method="cayley"):
     """
     Plot an example time evolution of the Diamond system.
 
@@ -104,6 +105,10 @@ def plot_example_evolution(n_cells=15, t1=0.1, t2=0.4, t3=0.7, t4=0.3, gamma1=0.
         Total evolution time (default: 49*dt for 50 colors)
     verbose : bool
         Whether to print system information
+    backend : str
+        Stepping backend of the lattice ("banded", "sparse" or "dense")
+    method : str
+        Time integrator of the lattice ("cayley", "krylov", "strang", "yoshida" or "midpoint")
 
     Returns:
     --------
@@ -121,7 +126,9 @@ def plot_example_evolution(n_cells=15, t1=0.1, t2=0.4, t3=0.7, t4=0.3, gamma1=0.
         t4=t4,  # A and C inter-cell hopping strength
         gamma1=gamma1,  # Gain coefficient (0, 1]
         gamma2=gamma2,  # Loss coefficient (0, 1]
-        S=S  # Saturation constant (>= 0)
+        S=S,  # Saturation constant (>= 0)
+        backend=backend,  # Stepping backend
+        method=method  # Time integrator
     )
 
     # Time evolution parameters
@@ -0,0 +1,150 @@
+"""
+Scalar observables evaluated inside the evolution loop.
+
+An ObservableRecorder has the same write(step, time, phi) interface as a
+TrajectorySink, so it can be passed as `sink=` to evolve_and_plot or
+find_and_plot_final_state, or fed from iter_evolution. Every stride-th state
+is reduced to a few floats, which avoids storing wave functions just to
+derive per-step quantities afterwards.
+"""
+import numpy as np
+
+
+def norm(system, phi, intensity):
+    """
+    Euclidean norm of the wave function.
+    """
+    return np.sqrt(intensity.sum())
+
+
+def inverse_participation_ratio(system, phi, intensity):
+    """
+    sum(I^2) / sum(I)^2: 1 for a state on a single site, 1/N for a uniform state.
+    """
+    total = intensity.sum()
+    return np.dot(intensity, intensity) / total ** 2 if total > 0 else np.nan
+
+
+def edge_weight(system, phi, intensity):
+    """
+    Fraction of the intensity in the first and last unit cell.
+    """
+    total = intensity.sum()
+    cell = len(system.sublattices)
+    return (intensity[:cell].sum() + intensity[-cell:].sum()) / total if total > 0 else np.nan
+
+
+def center_of_mass(system, phi, intensity):
+    """
+    Intensity-weighted mean site index, counting sites from 1 as in the plots.
+    """
+    total = intensity.sum()
+    return np.dot(np.arange(1, system.N + 1), intensity) / total if total > 0 else np.nan
+
+
+def sublattice_population(name):
+    """
+    Observable giving the fraction of the intensity on one sublattice.
+    """
+    def population(system, phi, intensity):
+        total = intensity.sum()
+        return intensity[system.sublattices[name]].sum() / total if total > 0 else np.nan
+
+    return population
+
+
+OBSERVABLES = {
+    "norm": norm,
+    "ipr": inverse_participation_ratio,
+    "edge_weight": edge_weight,
+    "center_of_mass": center_of_mass,
+}
+
+
+def default_observables(system):
+    """
+    The built-in observables plus one population per sublattice of the system.
+    """
+    observables = dict(OBSERVABLES)
+    for name in system.sublattices:
+        observables[f"population_{name}"] = sublattice_population(name)
+    return observables
+
+
+class ObservableRecorder:
+    """
+    Record scalar observables of every stride-th state into preallocated arrays.
+
+    Observables are functions f(system, phi, intensity) returning a float,
+    where intensity = |phi|^2 is computed once per recorded state.
+    """
+
+    def __init__(self, system, observables=None, stride=1, n_steps=None):
+        """
+        Initialize the recorder.
+
+        Parameters:
+        -----------
+        system : LatticeSystem
+            The system being evolved
+        observables : list or dict, optional
+            Names from default_observables(system), or a dict mapping names to
+            functions f(system, phi, intensity) (default: all built-in observables)
+        stride : int
+            Record every stride-th step, starting with step 0
+        n_steps : int, optional
+            Number of steps of the evolution, used to size the arrays exactly
+            (if None, the arrays grow geometrically as needed)
+        """
+        if stride < 1:
+            raise ValueError(f"stride must be at least 1, got {stride}")
+
+        available = default_observables(system)
+        if observables is None:
+            observables = available
+        elif not isinstance(observables, dict):
+            unknown = [name for name in observables if name not in available]
+            if unknown:
+                raise ValueError(f"Unknown observables {unknown}; available: {list(available)}")
+            observables = {name: available[name] for name in observables}
+
+        self.system = system
+        self.observables = observables
+        self.stride = stride
+        capacity = 1024 if n_steps is None else n_steps // stride + 1
+        self.times = np.empty(capacity)
+        self.values = {name: np.empty(capacity) for name in observables}
+        self.count = 0
+
+    def _grow(self):
+        capacity = 2 * len(self.times)
+        self.times = np.resize(self.times, capacity)
+        self.values = {name: np.resize(values, capacity) for name, values in self.values.items()}
+
+    def write(self, step, time, phi):
+        """
+        Evaluate the observables on phi if step is a multiple of the stride.
+        """
+        if step % self.stride:
+            return
+        if self.count == len(self.times):
+            self._grow()
+
+        intensity = np.abs(phi) ** 2
+        self.times[self.count] = time
+        for name, observable in self.observables.items():
+            self.values[name][self.count] = observable(self.system, phi, intensity)
+        self.count += 1
+
+    def __getitem__(self, name):
+        if name == "time":
+            return self.times[:self.count]
+        return self.values[name][:self.count]
+
+    def results(self):
+        """
+        Recorded times and observables as a dict of arrays.
+        """
+        results = {"time": self["time"]}
+        results.update((name, self[name]) for name in self.values)
+        return results
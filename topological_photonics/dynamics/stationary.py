@@ -0,0 +1,230 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import eigs, spsolve
+
+# Above this size the linear seed mode is found with ARPACK instead of a dense eigensolver
+DENSE_SEED_LIMIT = 500
+# Newton iterates whose norm falls below this fraction of the seed norm are collapsing to phi = 0
+NORM_FLOOR = 1e-3
+
+
+def linear_lasing_mode(system, onsite=0.0):
+    """
+    Find the most strongly amplified mode of the unsaturated lattice.
+
+    The gain is evaluated at zero intensity, so the returned mode is the
+    linear eigenvector whose eigenvalue has the largest imaginary part.
+
+    Parameters:
+    -----------
+    system : LatticeSystem
+        The lattice system
+    onsite : float
+        Linear onsite potential (default: 0.0)
+
+    Returns:
+    --------
+    mode : ndarray
+        Eigenvector normalized to unit norm
+    eigenvalue : complex
+        The corresponding linear eigenvalue
+    """
+    H = system.sparse_hopping() + sparse.diags(
+        system.onsite_diagonal(np.zeros(system.N), onsite), format="csr"
+    )
+
+    if system.N <= DENSE_SEED_LIMIT:
+        evals, evecs = np.linalg.eig(H.toarray())
+        index = np.argmax(evals.imag)
+        eigenvalue, mode = evals[index], evecs[:, index]
+    else:
+        evals, evecs = eigs(H, k=1, which="LI")
+        eigenvalue, mode = evals[0], evecs[:, 0]
+
+    return mode / np.linalg.norm(mode), eigenvalue
+
+
+def _residual(system, hopping, phi, energy, onsite, gauge_site):
+    """
+    Real residual vector [Re F, Im F, Im phi_k] of F = H(phi) phi - E phi.
+    """
+    F = hopping @ phi + (system.onsite_diagonal(phi, onsite) - energy) * phi
+    return np.concatenate([F.real, F.imag, [phi[gauge_site].imag]])
+
+
+def _jacobian(system, hopping, phi, energy, onsite, gauge_site):
+    """
+    Sparse Jacobian of the real residual with respect to [Re phi, Im phi, E].
+    """
+    N = system.N
+    intensity = np.abs(phi) ** 2
+
+    # Derivative of the saturable gain with respect to the site intensity
+    gain_slope = -1j * system.gain_profile * system.S / (1 + system.S * intensity) ** 2
+
+    M = (hopping + sparse.diags(system.onsite_diagonal(phi, onsite) - energy)).tocsr()
+    J_real = M + sparse.diags(2 * phi.real * gain_slope * phi)
+    J_imag = 1j * M + sparse.diags(2 * phi.imag * gain_slope * phi)
+
+    gauge_row = sparse.csr_matrix(([1.0], ([0], [gauge_site])), shape=(1, N))
+
+    return sparse.bmat([
+        [J_real.real, J_imag.real, sparse.csr_matrix(-phi.real[:, None])],
+        [J_real.imag, J_imag.imag, sparse.csr_matrix(-phi.imag[:, None])],
+        [None, gauge_row, None],
+    ], format="csc")
+
+
+def _seed_amplitude(system, mode):
+    """
+    Scale the linear mode so that its saturated gain balances the loss.
+
+    Returns the scale factor, or None when no finite scale exists (below
+    threshold the mode decays, and without saturation it never stops growing).
+    """
+    weights = np.abs(mode) ** 2
+    hopping_growth = np.vdot(mode, system.sparse_hopping() @ mode).imag
+
+    def net_growth(scale):
+        gain = system.gain_profile / (1 + system.S * scale ** 2 * weights)
+        return hopping_growth + np.sum(weights * (gain - system.loss_profile))
+
+    if net_growth(0.0) <= 0:
+        return 0.0
+
+    if system.S == 0 or hopping_growth - np.sum(weights * system.loss_profile) >= 0:
+        return None
+
+    low, high = 0.0, 1.0
+    while net_growth(high) > 0:
+        low, high = high, 2 * high
+
+    for _ in range(60):
+        middle = 0.5 * (low + high)
+        if net_growth(middle) > 0:
+            low = middle
+        else:
+            high = middle
+
+    return 0.5 * (low + high)
+
+
+def find_stationary_state(system, phi0=None, energy0=None, onsite=0.0, tolerance=1e-10,
+                          max_iterations=50, verbose=False):
+    """
+    Find a self-consistent stationary lasing mode H(phi) phi = E phi with real E.
+
+    The nonlinear eigenproblem is solved with Newton's method on the real
+    unknowns [Re phi, Im phi, E]. The global phase is fixed by requiring the
+    largest site of the seed to be real. Each Newton step is a sparse solve and
+    uses a backtracking line search. By default the seed is the most amplified
+    linear mode, scaled so that its saturated gain balances the loss.
+
+    phi = 0 solves the equations for every E, so Newton can be drawn to it
+    even above the lasing threshold. Steps that shrink the norm below
+    NORM_FLOOR times the seed norm are rejected, convergence is measured
+    relative to |phi|, and a run that still collapses is reported as not
+    converged.
+
+    Parameters:
+    -----------
+    system : LatticeSystem
+        The lattice system (NRSSHLatticeSystem or DiamondLatticeSystem)
+    phi0 : ndarray, optional
+        Initial guess for the mode (default: the scaled linear lasing mode)
+    energy0 : float, optional
+        Initial guess for the frequency (default: real part of the Rayleigh quotient of phi0)
+    onsite : float
+        Linear onsite potential (default: 0.0)
+    tolerance : float
+        Convergence tolerance on the largest residual component, relative to |phi|
+    max_iterations : int
+        Maximum number of Newton iterations
+    verbose : bool
+        Whether to print the residual at each iteration
+
+    Returns:
+    --------
+    phi : ndarray
+        Stationary mode (the zero state below the lasing threshold)
+    energy : float
+        Real frequency of the mode
+    iterations : int
+        Number of Newton iterations performed
+    converged : bool
+        Whether the residual dropped below the tolerance
+    """
+    hopping = system.sparse_hopping()
+
+    if phi0 is None:
+        mode, eigenvalue = linear_lasing_mode(system, onsite=onsite)
+        scale = _seed_amplitude(system, mode)
+
+        if scale == 0.0:
+            if verbose:
+                print("  Linear mode is below threshold; the stationary state is zero")
+            return np.zeros(system.N, dtype=complex), float(eigenvalue.real), 0, True
+
+        if scale is None:
+            if verbose:
+                print("  Gain never saturates below the loss; no finite stationary state")
+            return mode, float(eigenvalue.real), 0, False
+
+        phi0 = scale * mode
+
+    phi = np.asarray(phi0, dtype=complex).copy()
+    gauge_site = int(np.argmax(np.abs(phi)))
+    phi *= np.exp(-1j * np.angle(phi[gauge_site]))
+
+    if energy0 is None:
+        H_phi = hopping @ phi + system.onsite_diagonal(phi, onsite) * phi
+        energy0 = np.vdot(phi, H_phi).real / np.vdot(phi, phi).real
+    energy = float(energy0)
+
+    residual = _residual(system, hopping, phi, energy, onsite, gauge_site)
+    residual_norm = np.linalg.norm(residual)
+    norm_floor = NORM_FLOOR * np.linalg.norm(phi)
+    converged = False
+    iterations = 0
+
+    for iterations in range(1, max_iterations + 1):
+        J = _jacobian(system, hopping, phi, energy, onsite, gauge_site)
+        delta = spsolve(J, -residual)
+
+        delta_phi = delta[:system.N] + 1j * delta[system.N:2 * system.N]
+        delta_energy = delta[-1]
+
+        # Backtracking line search on the residual norm, never stepping towards phi = 0
+        alpha = 1.0
+        while True:
+            phi_trial = phi + alpha * delta_phi
+            energy_trial = energy + alpha * delta_energy
+            trial = _residual(system, hopping, phi_trial, energy_trial, onsite, gauge_site)
+            trial_norm = np.linalg.norm(trial)
+            if alpha < 1e-4:
+                break
+            if (trial_norm <= (1 - 1e-4 * alpha) * residual_norm
+                    and np.linalg.norm(phi_trial) >= norm_floor):
+                break
+            alpha /= 2
+
+        phi, energy, residual, residual_norm = phi_trial, energy_trial, trial, trial_norm
+
+        if verbose:
+            print(f"    Iteration {iterations}, residual = {residual_norm:.2e}, E = {energy:.6f}")
+
+        phi_norm = np.linalg.norm(phi)
+        if phi_norm < norm_floor:
+            if verbose:
+                print("  Collapsed to the zero state above the lasing threshold")
+            break
+
+        if np.max(np.abs(residual)) < tolerance * phi_norm:
+            converged = True
+            break
+
+    if verbose:
+        status = "Converged" if converged else "Did not converge"
+        print(f"  {status} after {iterations} iterations, E = {energy:.6f}")
+
+    return phi, float(energy), iterations, converged
@@ -0,0 +1,207 @@
+import numpy as np
+
+
+class AdaptiveStepper:
+    """
+    Error-controlled time stepping around a lattice system's Stepper.
+
+    Each trial step of size h is compared with two steps of size h/2 (step
+    doubling). The difference estimates the local error of the half-step
+    result, which is accepted when the error is below atol + rtol * |phi|.
+    The step size then grows while the state changes slowly and shrinks
+    during transients.
+
+    Step sizes are restricted to dt * 2**(k / LEVELS_PER_OCTAVE), so the
+    half steps stay on the same ladder and the system's Stepper for each size
+    is built once and reused by every trial step of that size. The
+    LINEAR_CACHE_SIZE most recently used steppers are kept. A step cut short
+    by max_step uses one-off steppers.
+
+    An attempt costs three steps, so adaptive stepping only pays off once
+    the accepted steps grow well beyond dt. With the first-order Cayley
+    method and the default rtol they stay close to dt, which makes adaptive
+    runs several times slower than fixed steps; use a second-order method
+    or a looser rtol to get long steps.
+    """
+
+    LEVELS_PER_OCTAVE = 4
+
+    def __init__(self, system, dt, rtol=1e-4, atol=1e-8, dt_min=None, dt_max=None, onsite=0.0,
+                 profiler=None):
+        """
+        Initialize the adaptive stepper.
+
+        Parameters:
+        -----------
+        system : LatticeSystem
+            The system to evolve
+        dt : float
+            Initial trial time step
+        rtol : float
+            Relative tolerance on the local error
+        atol : float
+            Absolute tolerance on the local error
+        dt_min : float, optional
+            Smallest allowed step (default: dt / 1000)
+        dt_max : float, optional
+            Largest allowed step (default: 100 * dt)
+        onsite : float
+            Linear onsite potential (default: 0.0)
+        profiler : StepProfiler, optional
+            Collector passed to every trial step of the system
+        """
+        self.system = system
+        self.dt = dt
+        self.rtol = rtol
+        self.atol = atol
+        self.dt_min = dt / 1000 if dt_min is None else dt_min
+        self.dt_max = 100 * dt if dt_max is None else dt_max
+        self.onsite = onsite
+        self.profiler = profiler
+        self.accepted = 0
+        self.rejected = 0
+
+        # Step sizes are self.size(level) with min_level <= level <= max_level
+        self.base_dt = dt
+        self.min_level = int(np.ceil(self.LEVELS_PER_OCTAVE * np.log2(self.dt_min / dt)))
+        self.max_level = int(np.floor(self.LEVELS_PER_OCTAVE * np.log2(self.dt_max / dt)))
+        self.level = 0
+        self.steppers = {}
+
+    def size(self, level):
+        """
+        Step size of a level of the ladder.
+        """
+        return self.base_dt * 2.0 ** (level / self.LEVELS_PER_OCTAVE)
+
+    def _stepper(self, level):
+        """
+        The system's Stepper for steps of the given level, least recently used ones evicted first.
+        """
+        stepper = self.steppers.pop(level, None)
+        if stepper is None:
+            stepper = self.system.stepper(self.size(level), onsite=self.onsite, profiler=self.profiler)
+            if len(self.steppers) >= self.system.LINEAR_CACHE_SIZE:
+                self.steppers.pop(next(iter(self.steppers)))
+        self.steppers[level] = stepper
+        return stepper
+
+    def _level_below(self, h):
+        """
+        Level of the largest step size on the ladder that does not exceed h.
+        """
+        return int(np.floor(self.LEVELS_PER_OCTAVE * np.log2(h / self.base_dt) + 1e-9))
+
+    def _set_level(self, level):
+        self.level = min(self.max_level, max(self.min_level, level))
+        self.dt = self.size(self.level)
+
+    def step(self, phi, max_step=None):
+        """
+        Take one accepted step.
+
+        Parameters:
+        -----------
+        phi : ndarray
+            Current wave function
+        max_step : float, optional
+            Upper bound on the step taken, e.g. the time left before a deadline
+
+        Returns:
+        --------
+        phi_new : ndarray
+            Wave function after the accepted step
+        h : float
+            Size of the accepted step
+        """
+        # Richardson factor and step-size exponent follow the integrator's order
+        order = self.system.order
+        phi = np.asarray(phi, dtype=complex)
+        full = np.empty_like(phi)
+
+        while True:
+            if max_step is None or self.dt <= max_step:
+                h = self.dt
+                stepper = self._stepper(self.level)
+                half_stepper = self._stepper(self.level - self.LEVELS_PER_OCTAVE)
+            else:
+                h = max_step
+                stepper = self.system.stepper(h, onsite=self.onsite, profiler=self.profiler)
+                half_stepper = self.system.stepper(h / 2, onsite=self.onsite, profiler=self.profiler)
+
+            stepper.step(phi, out=full)
+            half = half_stepper.step(phi, out=np.empty_like(phi))
+            half_stepper.step(half)
+
+            scale = self.atol + self.rtol * max(np.linalg.norm(phi), np.linalg.norm(half))
+            error = float(np.linalg.norm(half - full) / (2 ** order - 1) / scale)
+
+            if error > 0:
+                factor = 0.9 * error ** (-1 / (order + 1))
+            else:
+                factor = 5.0
+            factor = min(5.0, max(0.2, factor))
+
+            if error <= 1 or self.level == self.min_level:
+                self.accepted += 1
+                if h == self.dt or factor < 1:
+                    self._set_level(self._level_below(h * factor))
+                return half, h
+
+            self.rejected += 1
+            self._set_level(min(self._level_below(h * factor), self.level - 1))
+
+
+class StateHistory:
+    """
+    Fixed-size ring buffer of the most recent states of an evolution.
+
+    Memory stays at capacity x N regardless of how many states are pushed,
+    and a push is a single copy into preallocated storage.
+    """
+
+    def __init__(self, capacity, N, dtype=complex):
+        """
+        Initialize an empty history.
+
+        Parameters:
+        -----------
+        capacity : int
+            Number of states kept
+        N : int
+            Length of each state
+        dtype : data-type
+            Element type of the stored states (default: complex)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.states = np.empty((capacity, N), dtype=dtype)
+        self.times = np.empty(capacity)
+        self.capacity = capacity
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def push(self, phi, time):
+        """
+        Store a copy of phi at the given time, overwriting the oldest state when full.
+        """
+        slot = self.count % self.capacity
+        self.states[slot] = phi
+        self.times[slot] = time
+        self.count += 1
+
+    def newest_first(self):
+        """
+        Stored states and their times, ordered from the most recent to the oldest.
+
+        Returns:
+        --------
+        states : ndarray
+            Array of shape (len(self), N)
+        times : ndarray
+            Time of each state
+        """
+        order = (self.count - 1 - np.arange(len(self))) % self.capacity
+        return self.states[order], self.times[order]
@@ -0,0 +1,170 @@
+"""
+Streaming access to a time evolution.
+
+iter_evolution yields the states of a fixed-step evolution lazily, so a
+caller can analyse or store a trajectory without the evolution loop ever
+holding more than the current state. TrajectorySink writes every k-th state
+into a preallocated .npy file through a memory map, which keeps very long
+trajectories of large chains out of RAM.
+"""
+import numpy as np
+
+
+def iter_evolution(system, dt, n_steps=None, phi0=None, onsite=0.0, profiler=None):
+    """
+    Evolve a system with fixed steps and yield every state.
+
+    Parameters:
+    -----------
+    system : LatticeSystem
+        The system to evolve
+    dt : float
+        Time step
+    n_steps : int, optional
+        Number of steps to take (if None, evolve until the caller stops iterating)
+    phi0 : ndarray, optional
+        Initial wave function (default: all intensity on the first site)
+    onsite : float
+        Linear onsite potential (default: 0.0)
+    profiler : StepProfiler, optional
+        Collector for the time spent in each part of every step; the run is
+        recorded when the generator finishes or is closed
+
+    Yields:
+    -------
+    step : int
+        Number of steps taken, starting with 0 for the initial state
+    time : float
+        Evolution time of the state
+    phi : ndarray
+        Wave function at that time. The same array is updated in place by
+        every step, so copy it to keep it past the next iteration.
+    """
+    if n_steps is not None and n_steps < 0:
+        raise ValueError(f"n_steps must be non-negative, got {n_steps}")
+
+    if phi0 is None:
+        phi = np.zeros(system.N, dtype=complex)
+        phi[0] = 1.0
+    else:
+        phi = np.array(phi0, dtype=complex)
+
+    stepper = system.stepper(dt, onsite=onsite, profiler=profiler)
+    step = 0
+    time = 0.0
+    try:
+        yield step, time, phi
+        while n_steps is None or step < n_steps:
+            stepper.step(phi)
+            step += 1
+            time += dt
+            yield step, time, phi
+    finally:
+        if profiler is not None:
+            profiler.count_step(step)
+            profiler.record_run(step, time, phi)
+
+
+class TrajectorySink:
+    """
+    Write every stride-th state of an evolution into a memory-mapped .npy file.
+
+    The file is preallocated for n_steps // stride + 1 states, so it can be
+    opened with np.load(path, mmap_mode="r") while or after it is written.
+    States are stored as complex64 by default, halving the size of the file.
+    """
+
+    def __init__(self, path, N, n_steps, stride=1, dtype=np.complex64):
+        """
+        Create the output file.
+
+        Parameters:
+        -----------
+        path : str
+            Output .npy file, overwritten if it exists
+        N : int
+            Number of sites of the system
+        n_steps : int
+            Number of steps of the evolution that will be written
+        stride : int
+            Keep every stride-th step, starting with step 0
+        dtype : data-type
+            Element type of the stored states (default: complex64)
+        """
+        if stride < 1:
+            raise ValueError(f"stride must be at least 1, got {stride}")
+        if n_steps < 0:
+            raise ValueError(f"n_steps must be non-negative, got {n_steps}")
+
+        self.path = path
+        self.stride = stride
+        self.states = np.lib.format.open_memmap(path, mode="w+", dtype=dtype,
+                                                shape=(n_steps // stride + 1, N))
+        self.times = np.full(len(self.states), np.nan)
+        self.count = 0
+
+    def write(self, step, time, phi):
+        """
+        Store phi if step is a multiple of the stride.
+        """
+        if step % self.stride:
+            return
+        if self.count >= len(self.states):
+            raise ValueError(f"{self.path} is full after {self.count} states")
+        self.states[self.count] = phi
+        self.times[self.count] = time
+        self.count += 1
+
+    def close(self):
+        """
+        Flush the written states to disk and release the memory map.
+        """
+        if self.states is not None:
+            self.states.flush()
+            self.states = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def record_trajectory(system, dt, n_steps, path, stride=1, phi0=None, onsite=0.0, dtype=np.complex64,
+                      profiler=None):
+    """
+    Evolve a system and write every stride-th state to a .npy file.
+
+    Parameters:
+    -----------
+    system : LatticeSystem
+        The system to evolve
+    dt : float
+        Time step
+    n_steps : int
+        Number of steps to take
+    path : str
+        Output .npy file
+    stride : int
+        Keep every stride-th step, starting with step 0
+    phi0 : ndarray, optional
+        Initial wave function (default: all intensity on the first site)
+    onsite : float
+        Linear onsite potential (default: 0.0)
+    dtype : data-type
+        Element type of the stored states (default: complex64)
+    profiler : StepProfiler, optional
+        Collector for the time spent in each part of every step
+
+    Returns:
+    --------
+    final_phi : ndarray
+        Wave function after the last step, at full precision
+    times : ndarray
+        Time of every stored state
+    """
+    with TrajectorySink(path, system.N, n_steps, stride=stride, dtype=dtype) as sink:
+        for step, time, phi in iter_evolution(system, dt, n_steps, phi0=phi0, onsite=onsite,
+                                              profiler=profiler):
+            sink.write(step, time, phi)
+    return phi.copy(), sink.times
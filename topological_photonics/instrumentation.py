@@ -0,0 +1,130 @@
+import json
+import time
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+_NO_SECTION = nullcontext()
+
+
+def section(profiler, name):
+    """
+    Context manager timing one section of a step, or a no-op when profiler is None.
+    """
+    if profiler is None:
+        return _NO_SECTION
+    return profiler.section(name)
+
+
+class StepProfiler:
+    """
+    Collector for per-step timings of the evolution loops.
+
+    Pass one instance as `profiler=` to LatticeSystem.step, AdaptiveStepper,
+    find_convergence_time, create_phase_grid, evolve_and_plot or
+    find_and_plot_final_state. It accumulates wall time per section, the
+    number of steps and, for every finished run, its step count, final time,
+    final norm and whether it converged. A single profiler can be reused
+    across a whole sweep.
+
+    Sections recorded by the evolution code:
+    - "hamiltonian": assembling the onsite gain/loss terms (or the full dense H)
+    - "propagator": building the Cayley operator or its factorization
+    - "update": applying the propagator to the state
+    - "convergence": computing the change in total intensity
+    """
+
+    SECTIONS = ("hamiltonian", "propagator", "update", "convergence")
+
+    def __init__(self):
+        self.timings = dict.fromkeys(self.SECTIONS, 0.0)
+        self.calls = dict.fromkeys(self.SECTIONS, 0)
+        self.steps = 0
+        self.runs = []
+
+    @contextmanager
+    def section(self, name):
+        """
+        Add the wall time spent inside the block to section `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count_step(self, n=1):
+        """
+        Record n completed time steps.
+        """
+        self.steps += n
+
+    def record_run(self, steps, final_time, phi, converged=None):
+        """
+        Record the outcome of one evolution.
+
+        Parameters:
+        -----------
+        steps : int
+            Number of steps taken
+        final_time : float
+            Time at which the evolution stopped
+        phi : ndarray
+            Final wave function
+        converged : bool, optional
+            Whether the run met its convergence criterion
+        """
+        self.runs.append({
+            "steps": int(steps),
+            "time": float(final_time),
+            "norm": float(np.linalg.norm(phi)),
+            "converged": None if converged is None else bool(converged),
+        })
+
+    def report(self):
+        """
+        Collected data as a JSON-serializable dict.
+        """
+        total = sum(self.timings.values())
+        return {
+            "steps": self.steps,
+            "total_time": total,
+            "sections": {
+                name: {
+                    "time": elapsed,
+                    "calls": self.calls[name],
+                    "fraction": elapsed / total if total > 0 else 0.0,
+                }
+                for name, elapsed in self.timings.items()
+            },
+            "runs": self.runs,
+        }
+
+    def summary(self):
+        """
+        Human-readable table of where the time went.
+        """
+        report = self.report()
+        lines = [f"{report['steps']} steps, {len(self.runs)} runs, "
+                 f"{report['total_time']:.4f} s in instrumented sections"]
+        for name, entry in report["sections"].items():
+            per_call = entry["time"] / entry["calls"] * 1e6 if entry["calls"] else 0.0
+            lines.append(f"  {name:12s} {entry['time']:10.4f} s {100 * entry['fraction']:6.1f}% "
+                         f"{entry['calls']:10d} calls {per_call:10.2f} us/call")
+        if self.runs:
+            converged = sum(1 for run in self.runs if run["converged"])
+            norms = [run["norm"] for run in self.runs]
+            lines.append(f"  {converged}/{len(self.runs)} runs converged, "
+                         f"final norms in [{min(norms):.4g}, {max(norms):.4g}]")
+        return "\n".join(lines)
+
+    def dump(self, path=None):
+        """
+        Print the summary, or write the full report as JSON when a path is given.
+        """
+        if path is None:
+            print(self.summary())
+            return
+        with open(path, "w") as handle:
+            json.dump(self.report(), handle, indent=2)
@@ -0,0 +1,1140 @@
+from functools import cached_property
+
+import numpy as np
+from scipy import sparse
+from scipy.linalg import expm, lapack, solve_banded
+from scipy.sparse.linalg import splu
+
+from topological_photonics.instrumentation import section
+
+
+def banded_matvec(ab, lower, upper, x):
+    """
+    Multiply a matrix held in LAPACK banded storage by a vector.
+
+    Leading axes of `ab` and `x` are treated as batch axes, so a stack of
+    banded matrices can be applied to a stack of vectors at once.
+
+    Parameters:
+    -----------
+    ab : ndarray
+        Banded matrix of shape (..., lower + upper + 1, N) with ab[upper + i - j, j] = A[i, j]
+    lower : int
+        Number of sub-diagonals
+    upper : int
+        Number of super-diagonals
+    x : ndarray
+        Vector(s) of shape (..., N)
+
+    Returns:
+    --------
+    y : ndarray
+        The product A @ x
+    """
+    y = ab[..., upper, :] * x
+
+    for k in range(1, upper + 1):
+        y[..., :-k] += ab[..., upper - k, k:] * x[..., k:]
+
+    for k in range(1, lower + 1):
+        y[..., k:] += ab[..., upper + k, :-k] * x[..., :-k]
+
+    return y
+
+
+def solve_banded_batched(lower, upper, ab, rhs):
+    """
+    Solve a stack of banded linear systems with vectorized Gaussian elimination.
+
+    The batch is the last, contiguous axis, so each step of the elimination is
+    one NumPy operation on a contiguous vector of the batch size. Elimination
+    runs without pivoting along the sites, which costs O(N) such operations
+    whatever the batch size: batching only beats one LAPACK call per system
+    when the batch is large compared with N. The Crank-Nicolson matrices
+    I + iH*dt/2 are diagonally dominant for small time steps, which keeps this
+    stable. Nothing guarantees that for large steps or strong gain, so systems
+    that meet a pivot smaller than sqrt(eps) times their largest entry, or end
+    up with a non-finite solution, are reported as failed and have to be
+    solved again with a pivoting solver.
+
+    Parameters:
+    -----------
+    lower : int
+        Number of sub-diagonals
+    upper : int
+        Number of super-diagonals
+    ab : ndarray
+        Banded matrices of shape (lower + upper + 1, N, batch); overwritten
+    rhs : ndarray
+        Right-hand sides of shape (N, batch); overwritten
+
+    Returns:
+    --------
+    x : ndarray
+        Solutions of shape (N, batch), stored in rhs
+    failed : ndarray
+        Boolean array of the systems whose solution is not to be trusted
+    """
+    N = ab.shape[1]
+    threshold = np.sqrt(np.finfo(float).eps) * np.abs(ab).max(axis=(0, 1))
+
+    # A failed elimination shows up as a small pivot or a non-finite solution below
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Forward elimination: A[i, c] is stored at ab[upper + i - c, c]
+        for j in range(N - 1):
+            pivot = ab[upper, j]
+            for k in range(1, min(lower, N - 1 - j) + 1):
+                factor = ab[upper + k, j] / pivot
+                for c in range(j + 1, min(j + upper, N - 1) + 1):
+                    ab[upper + j + k - c, c] -= factor * ab[upper + j - c, c]
+                rhs[j + k] -= factor * rhs[j]
+
+        # Back substitution through the upper band
+        for j in range(N - 1, -1, -1):
+            for c in range(j + 1, min(j + upper, N - 1) + 1):
+                rhs[j] -= ab[upper + j - c, c] * rhs[c]
+            rhs[j] /= ab[upper, j]
+
+    # The pivots are the diagonal left by the elimination
+    failed = ~np.all(np.abs(ab[upper]) > threshold, axis=0)
+    failed |= ~np.all(np.isfinite(rhs), axis=0)
+
+    return rhs, failed
+
+
+def saturable_gain_loss(gain_profile, loss_profile, S, phi):
+    """
+    Imaginary onsite terms i * (gain / (1 + S|phi|^2) - loss), evaluated element-wise.
+    """
+    return 1j * (gain_profile / (1 + S * np.abs(phi) ** 2) - loss_profile)
+
+
+def cayley_system(hopping_bands, lower, upper, diagonal, phi, dt):
+    """
+    Banded matrix I + iH*dt/2 and right-hand side (I - iH*dt/2) * phi of a Cayley step.
+
+    Parameters:
+    -----------
+    hopping_bands : ndarray
+        Hopping Hamiltonian in LAPACK banded storage
+    lower : int
+        Number of sub-diagonals
+    upper : int
+        Number of super-diagonals
+    diagonal : ndarray
+        Onsite terms added to the main diagonal of the hopping Hamiltonian
+    phi : ndarray
+        Current wave function
+    dt : float
+        Time step
+
+    Returns:
+    --------
+    ab : ndarray
+        I + iH*dt/2 in banded storage
+    rhs : ndarray
+        (I - iH*dt/2) * phi
+    """
+    ab = 0.5j * dt * hopping_bands
+    ab[upper] += 1 + 0.5j * dt * diagonal
+
+    # (I - iH*dt/2) phi = 2 phi - (I + iH*dt/2) phi
+    rhs = 2 * phi - banded_matvec(ab, lower, upper, phi)
+
+    return ab, rhs
+
+
+def saturable_gain_loss_flow(gain_profile, loss_profile, S, phi, dt, max_iterations=100):
+    """
+    Exact solution of the onsite gain/loss dynamics over a time dt, site by site.
+
+    Without hopping every site obeys d(phi)/dt = (gain / (1 + S|phi|^2) - loss) * phi,
+    which keeps the phase of phi and changes the intensity I = |phi|^2 as
+
+        dI/dt = 2 * (gain / (1 + S*I) - loss) * I
+
+    This has a closed-form implicit solution t(I). It is inverted with a
+    Newton iteration in ln(I), safeguarded by bisection inside the bounds
+    I0 * exp(-2 * loss * dt) <= I <= I0 * exp(2 * (gain - loss) * dt) and the
+    saturated fixed point. dt may be negative.
+
+    Parameters:
+    -----------
+    gain_profile : ndarray
+        Gain on every site
+    loss_profile : ndarray
+        Loss on every site
+    S : float
+        Saturation constant
+    phi : ndarray
+        Wave function
+    dt : float
+        Time step
+    max_iterations : int
+        Maximum number of Newton/bisection iterations
+
+    Returns:
+    --------
+    phi_new : ndarray
+        Wave function after the gain/loss flow
+    """
+    gain = np.broadcast_to(gain_profile, phi.shape).astype(float)
+    loss = np.broadcast_to(loss_profile, phi.shape).astype(float)
+    net = gain - loss
+
+    if S == 0 or dt == 0:
+        return phi * np.exp(net * dt)
+
+    I0 = np.abs(phi) ** 2
+    # Sites with no intensity, or exactly at the saturated intensity, do not change
+    slope = np.sign(net - loss * S * I0)
+    moving = (I0 > 0) & (slope != 0)
+    if not np.any(moving):
+        return phi.copy()
+
+    g, l, a, I0, slope = gain[moving], loss[moving], net[moving], I0[moving], slope[moving]
+    u0 = np.log(I0)
+    general = (l > 0) & (np.abs(a) > 1e-12)
+    pure_gain = l == 0
+    balanced = ~general & ~pure_gain
+
+    # Safe denominators for the branches that are masked out below
+    a_safe = np.where(np.abs(a) > 1e-12, a, 1.0)
+    l_safe = np.where(l > 0, l, 1.0)
+
+    def elapsed(u):
+        """
+        Time t(u) to go from ln(I0) to u along the flow.
+        """
+        # Every branch is evaluated everywhere, so the ones masked out below may overflow
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            I = np.exp(u)
+            ratio = (a - l * S * I) / (a - l * S * I0)
+            t_general = (u - u0 - g / l_safe * np.log(ratio)) / (2 * a_safe)
+            t_gain = (u - u0 + S * (I - I0)) / (2 * a_safe)
+            t_balanced = ((np.exp(-u) - 1 / I0) - S * (u - u0)) / (2 * l_safe * S)
+        return np.where(general, t_general, np.where(pure_gain, t_gain, t_balanced))
+
+    def rate(u):
+        """
+        dt/du along the flow.
+        """
+        I = np.exp(u)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (1 + S * I) / (2 * (a - l * S * I))
+
+    # The log-intensity growth rate lies in [-2 * loss, 2 * (gain - loss)]
+    low = u0 + np.minimum(-2 * l * dt, 2 * a * dt)
+    high = u0 + np.maximum(-2 * l * dt, 2 * a * dt)
+
+    # The flow never crosses the saturated intensity a / (l * S)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u_fixed = np.log(np.where((l > 0) & (a > 0), a / (l_safe * S), np.nan))
+    has_fixed = ~np.isnan(u_fixed)
+    high = np.where(has_fixed & (slope > 0), np.minimum(high, u_fixed), high)
+    low = np.where(has_fixed & (slope < 0), np.maximum(low, u_fixed), low)
+
+    # Start from an explicit Euler step in ln(I)
+    u = np.clip(u0 + dt / rate(u0), low, high)
+
+    for _ in range(max_iterations):
+        residual = elapsed(u) - dt
+        too_short = (residual * slope < 0) | (~np.isfinite(residual) & (u < u0))
+        low = np.where(too_short, u, low)
+        high = np.where(too_short, high, u)
+
+        with np.errstate(invalid="ignore"):
+            newton = u - residual / rate(u)
+        bisection = 0.5 * (low + high)
+        inside = np.isfinite(newton) & (newton >= low) & (newton <= high)
+        u_new = np.where(inside, newton, bisection)
+
+        if np.all(np.abs(u_new - u) <= 1e-14 * np.maximum(1.0, np.abs(u))):
+            u = u_new
+            break
+        u = u_new
+
+    scale = np.ones(phi.shape)
+    scale[moving] = np.exp(0.5 * (u - u0))
+    return phi * scale
+
+
+def crank_nicolson_step(hopping_bands, lower, upper, diagonal, phi, dt):
+    """
+    Apply the second-order Cayley propagator to a state using a banded solve.
+
+    phi(t + dt) = (I + iH*dt/2)^(-1) * (I - iH*dt/2) * phi(t)
+
+    The two factors commute, so this is the same operator as the dense
+    time evolution operator, but it costs O(N) per step instead of O(N^3).
+
+    Parameters:
+    -----------
+    hopping_bands : ndarray
+        Hopping Hamiltonian in LAPACK banded storage
+    lower : int
+        Number of sub-diagonals
+    upper : int
+        Number of super-diagonals
+    diagonal : ndarray
+        Onsite terms added to the main diagonal of the hopping Hamiltonian
+    phi : ndarray
+        Current wave function
+    dt : float
+        Time step
+
+    Returns:
+    --------
+    phi_new : ndarray
+        Wave function after one time step
+    """
+    ab, rhs = cayley_system(hopping_bands, lower, upper, diagonal, phi, dt)
+
+    return solve_banded((lower, upper), ab, rhs, overwrite_ab=True, overwrite_b=True,
+                        check_finite=False)
+
+
+def crank_nicolson_step_batched(hopping_bands, lower, upper, diagonals, phis, dt):
+    """
+    Apply the second-order Cayley propagator to a stack of states at once.
+
+    The batch is the last axis of every array (see solve_banded_batched).
+    Systems the vectorized elimination cannot solve reliably are solved again
+    one by one with LAPACK.
+
+    Parameters:
+    -----------
+    hopping_bands : ndarray
+        Hopping Hamiltonians in LAPACK banded storage, shape (lower + upper + 1, N, batch)
+        or a single (lower + upper + 1, N) array shared by the whole batch
+    lower : int
+        Number of sub-diagonals
+    upper : int
+        Number of super-diagonals
+    diagonals : ndarray
+        Onsite terms of shape (N, batch)
+    phis : ndarray
+        Current wave functions of shape (N, batch)
+    dt : float
+        Time step
+
+    Returns:
+    --------
+    phis_new : ndarray
+        Wave functions after one time step, shape (N, batch)
+    """
+    if hopping_bands.ndim == 2:
+        hopping_bands = hopping_bands[..., None]
+
+    ab = np.empty(hopping_bands.shape[:2] + phis.shape[1:], dtype=complex)
+    ab[:] = 0.5j * dt * hopping_bands
+    ab[upper] += 1 + 0.5j * dt * diagonals
+
+    # (I - iH*dt/2) phi = 2 phi - (I + iH*dt/2) phi
+    rhs = (2 - ab[upper]) * phis
+    for k in range(1, upper + 1):
+        rhs[:-k] -= ab[upper - k, k:] * phis[k:]
+    for k in range(1, lower + 1):
+        rhs[k:] -= ab[upper + k, :-k] * phis[:-k]
+
+    phis_new, failed = solve_banded_batched(lower, upper, ab, rhs)
+
+    for b in np.flatnonzero(failed):
+        bands = hopping_bands[..., min(b, hopping_bands.shape[-1] - 1)]
+        phis_new[:, b] = crank_nicolson_step(bands, lower, upper, diagonals[:, b], phis[:, b], dt)
+
+    return phis_new
+
+
+def arnoldi_expm_multiply(matvec, phi, dt, krylov_dim=20, tolerance=1e-10):
+    """
+    Apply exp(-iA*dt) to a vector with an Arnoldi (Krylov subspace) expansion.
+
+    A Krylov basis of dimension krylov_dim is built from phi with repeated
+    matrix-vector products, and the exponential of the small projected
+    Hessenberg matrix is taken instead of that of A. A is not assumed to be
+    Hermitian. When the a posteriori error estimate exceeds tolerance * |phi|,
+    the interval is split into smaller substeps.
+
+    Parameters:
+    -----------
+    matvec : callable
+        Function returning A @ v
+    phi : ndarray
+        Vector to propagate
+    dt : float
+        Time step
+    krylov_dim : int
+        Maximum dimension of the Krylov subspace
+    tolerance : float
+        Relative error tolerance per step
+
+    Returns:
+    --------
+    phi_new : ndarray
+        exp(-iA*dt) @ phi
+    """
+    N = phi.shape[0]
+    m = min(krylov_dim, N)
+    result = np.asarray(phi, dtype=complex)
+    # Negative steps (e.g. inside higher-order compositions) run backwards in time
+    direction = np.sign(dt)
+    remaining = abs(dt)
+    tau = remaining
+
+    while remaining > 0:
+        tau = min(tau, remaining)
+        beta = np.linalg.norm(result)
+        if beta == 0:
+            return result
+
+        V = np.zeros((m + 1, N), dtype=complex)
+        H = np.zeros((m + 1, m), dtype=complex)
+        V[0] = result / beta
+        k = m
+        for j in range(m):
+            w = matvec(V[j])
+            # Classical Gram-Schmidt applied twice keeps the basis orthogonal
+            for _ in range(2):
+                projection = V[:j + 1].conj() @ w
+                w = w - projection @ V[:j + 1]
+                H[:j + 1, j] += projection
+            H[j + 1, j] = np.linalg.norm(w)
+            if H[j + 1, j] <= 1e-12 * beta:
+                # The subspace is invariant, so the projection is exact
+                k = j + 1
+                break
+            V[j + 1] = w / H[j + 1, j]
+
+        propagator = expm(-1j * direction * tau * H[:k, :k])
+        error = H[k, k - 1].real * abs(propagator[k - 1, 0]) if k < N else 0.0
+
+        if error > tolerance and tau > abs(dt) * 1e-6:
+            tau /= 2
+            continue
+
+        result = beta * (propagator[:, 0] @ V[:k])
+        remaining -= tau
+
+    return result
+
+
+class LatticeSystem:
+    """
+    Shared stepping machinery for lattice models whose hopping Hamiltonian is banded.
+
+    Subclasses set N, backend, H_bands, the sublattice index arrays and the
+    per-site gain/loss profiles, and provide `_build_base_hamiltonian`.
+
+    Backends:
+    - "dense": H_base is a dense array and every step inverts the full operator
+    - "banded": steps use a LAPACK banded solve on the state vector
+    - "sparse": H_base is a CSR matrix and steps factorize a sparse matrix whose
+      diagonal is updated in place, without copying the hopping part
+
+    Methods (time integrators):
+    - "cayley": Cayley (Crank-Nicolson) propagator with the saturable gain
+      frozen at the start of the step; second order for linear systems and
+      first order otherwise
+    - "krylov": exp(-iH*dt) applied with an Arnoldi expansion; the nonlinear
+      diagonal is evaluated at an exponential-midpoint predictor, so the
+      scheme is exact for linear problems and second order otherwise
+    - "strang": second-order split step alternating the exact onsite gain/loss
+      flow with the exact propagator of the constant hopping Hamiltonian
+    - "yoshida": fourth-order composition of three Strang steps
+    - "midpoint": implicit Crank-Nicolson with the gain evaluated at the
+      midpoint state (phi + phi_new) / 2, solved by fixed-point iteration
+      (at most implicit_max_iterations corrections, stopping once the
+      relative change is below implicit_tolerance)
+    """
+
+    BACKENDS = ("dense", "banded", "sparse")
+    METHODS = ("cayley", "krylov", "strang", "yoshida", "midpoint")
+    METHOD_ORDERS = {"cayley": 1, "krylov": 2, "strang": 2, "yoshida": 4, "midpoint": 2}
+    LINEAR_CACHE_SIZE = 8
+    YOSHIDA_WEIGHTS = (1 / (2 - 2 ** (1 / 3)), -2 ** (1 / 3) / (2 - 2 ** (1 / 3)),
+                       1 / (2 - 2 ** (1 / 3)))
+    krylov_dim = 20
+    krylov_tolerance = 1e-10
+    implicit_max_iterations = 10
+    implicit_tolerance = 1e-12
+
+    lower = 1
+    upper = 1
+
+    def _check_backend(self, backend):
+        """
+        Raise a ValueError for unknown backends.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"backend must be one of {self.BACKENDS}, got {backend!r}")
+
+    def _check_method(self, method):
+        """
+        Raise a ValueError for unknown time integrators.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got {method!r}")
+
+    @cached_property
+    def H_base(self):
+        """
+        Hopping Hamiltonian, built on first access.
+
+        This is a CSR matrix for the sparse backend and a dense array otherwise.
+        The banded backend only needs H_bands, so large systems never allocate
+        the O(N^2) matrix unless it is explicitly requested.
+        """
+        if self.backend == "sparse":
+            return self.sparse_hopping()
+        return self._build_base_hamiltonian()
+
+    def sparse_hopping(self):
+        """
+        Hopping Hamiltonian as a CSR matrix, whatever the backend.
+        """
+        return self._build_sparse_operator(include_diagonal=False).tocsr()
+
+    def _build_sparse_operator(self, include_diagonal=True):
+        """
+        Build the hopping terms as a CSC matrix from H_bands.
+
+        With include_diagonal=True every main-diagonal entry is stored explicitly
+        (even when zero), so onsite terms can later be written straight into `data`.
+        """
+        rows, cols, values = [], [], []
+        sites = np.arange(self.N)
+
+        for k in range(-self.lower, self.upper + 1):
+            if k == 0 and not include_diagonal:
+                continue
+            row = sites[max(0, -k):self.N - max(0, k)]
+            rows.append(row)
+            cols.append(row + k)
+            values.append(self.H_bands[self.upper - k, row + k])
+
+        operator = sparse.coo_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.N, self.N),
+        ).tocsc()
+
+        if not include_diagonal:
+            operator.eliminate_zeros()
+
+        return operator
+
+    @cached_property
+    def _sparse_workspace(self):
+        """
+        Reusable CSC matrix, the hopping values and the positions of its diagonal in `data`.
+        """
+        operator = self._build_sparse_operator(include_diagonal=True)
+        column_of_entry = np.repeat(np.arange(self.N), np.diff(operator.indptr))
+        diagonal_index = np.flatnonzero(operator.indices == column_of_entry)
+        return operator, operator.data.copy(), diagonal_index
+
+    def get_hamiltonian(self, phi=None, onsite=0.0):
+        """
+        Get the full Hamiltonian including onsite terms.
+
+        Parameters:
+        -----------
+        phi : array_like, optional
+            Wave function for nonlinear onsite potentials
+        onsite : float
+            Linear onsite potential (default: 0.0)
+
+        Returns:
+        --------
+        H : ndarray or scipy.sparse.csr_matrix
+            Full Hamiltonian matrix (sparse for the sparse backend)
+        """
+        if self.backend == "sparse":
+            return self.H_base + sparse.diags(self.onsite_diagonal(phi, onsite), format="csr")
+
+        H = self.H_base.copy()
+        H[np.diag_indices(self.N)] += self.onsite_diagonal(phi, onsite)
+
+        return H
+
+    def gain_loss_diagonal(self, phi):
+        """
+        Saturable gain and constant loss on every site as a diagonal vector.
+
+        i * (gain_profile / (1 + S|phi|^2) - loss_profile)
+
+        Parameters:
+        -----------
+        phi : array_like
+            Wave function
+
+        Returns:
+        --------
+        diagonal : ndarray
+            Imaginary onsite gain/loss terms
+        """
+        return saturable_gain_loss(self.gain_profile, self.loss_profile, self.S, phi)
+
+    def onsite_diagonal(self, phi=None, onsite=0.0):
+        """
+        Onsite terms of the Hamiltonian as a vector.
+
+        Parameters:
+        -----------
+        phi : array_like, optional
+            Wave function for nonlinear onsite potentials
+        onsite : float
+            Linear onsite potential (default: 0.0)
+
+        Returns:
+        --------
+        diagonal : ndarray
+            Linear onsite potential plus gain/loss terms on every site
+        """
+        diagonal = np.full(self.N, onsite, dtype=complex)
+        if phi is not None:
+            diagonal += self.gain_loss_diagonal(phi)
+        return diagonal
+
+    def time_evolution_operator(self, H, dt):
+        """
+        Calculate the second-order time evolution operator.
+
+        U(t) = (I - iH*dt/2) * (I + iH*dt/2)^(-1)
+
+        Parameters:
+        -----------
+        H : ndarray
+            Hamiltonian matrix
+        dt : float
+            Time step
+
+        Returns:
+        --------
+        U : ndarray
+            Time evolution operator
+        """
+        if sparse.issparse(H):
+            H = H.toarray()
+
+        I = np.identity(self.N)
+        U = np.dot(I - 1j * dt * H / 2, np.linalg.inv(I + 1j * dt * H / 2))
+        return U
+
+    def step(self, phi, dt, onsite=0.0, profiler=None):
+        """
+        Evolve a wave function by one time step with the system's integrator.
+
+        Parameters:
+        -----------
+        phi : ndarray
+            Current wave function
+        dt : float
+            Time step
+        onsite : float
+            Linear onsite potential (default: 0.0)
+        profiler : StepProfiler, optional
+            Collector for the time spent in each part of the step
+
+        Returns:
+        --------
+        phi_new : ndarray
+            Wave function after one time step
+        """
+        if self.method == "krylov":
+            return self._krylov_step(phi, dt, onsite, profiler)
+        if self.method in ("strang", "yoshida"):
+            return self._split_step(phi, dt, onsite, profiler)
+
+        if self.is_linear:
+            with section(profiler, "propagator"):
+                propagate = self._linear_propagator(dt, onsite)
+            with section(profiler, "update"):
+                return propagate(phi)
+
+        with section(profiler, "hamiltonian"):
+            diagonal = onsite + self.gain_loss_diagonal(phi)
+        phi_new = self._cayley_step(diagonal, phi, dt, profiler)
+
+        if self.method == "midpoint":
+            for _ in range(self.implicit_max_iterations):
+                with section(profiler, "hamiltonian"):
+                    diagonal = onsite + self.gain_loss_diagonal(0.5 * (phi + phi_new))
+                candidate = self._cayley_step(diagonal, phi, dt, profiler)
+                change = np.linalg.norm(candidate - phi_new)
+                phi_new = candidate
+                if change <= self.implicit_tolerance * np.linalg.norm(phi_new):
+                    break
+
+        return phi_new
+
+    def stepper(self, dt, onsite=0.0, profiler=None):
+        """
+        Reusable fixed-step integrator that advances states in place.
+
+        See Stepper; its results match `step` up to rounding.
+        """
+        return Stepper(self, dt, onsite=onsite, profiler=profiler)
+
+    def _cayley_step(self, diagonal, phi, dt, profiler=None):
+        """
+        Cayley step with the given onsite diagonal on the system's backend.
+        """
+        if self.backend == "dense":
+            with section(profiler, "propagator"):
+                H = self.H_base.copy()
+                H[np.diag_indices(self.N)] += diagonal
+                U = self.time_evolution_operator(H, dt)
+            with section(profiler, "update"):
+                return np.dot(U, phi)
+
+        if self.backend == "sparse":
+            return self._sparse_step(diagonal, phi, dt, profiler)
+
+        with section(profiler, "propagator"):
+            ab, rhs = cayley_system(self.H_bands, self.lower, self.upper, diagonal, phi, dt)
+        with section(profiler, "update"):
+            return solve_banded((self.lower, self.upper), ab, rhs, overwrite_ab=True,
+                                overwrite_b=True, check_finite=False)
+
+    @property
+    def is_linear(self):
+        """
+        Whether the Hamiltonian is independent of the state (no gain, or no saturation).
+
+        The onsite terms are then the constant i * (gain - loss) (S = 0) or
+        -i * loss (no gain), so one factorized propagator serves every step.
+        """
+        return self.S == 0 or not np.any(self.gain_profile)
+
+    @property
+    def order(self):
+        """
+        Order of accuracy of the time integrator: the local error of a step scales as dt^(order + 1).
+        """
+        if self.method == "cayley" and self.is_linear:
+            return 2
+        return self.METHOD_ORDERS[self.method]
+
+    @cached_property
+    def _linear_propagators(self):
+        """
+        Factorized Cayley propagators of a linear system, keyed by (dt, onsite).
+        """
+        return {}
+
+    def _linear_propagator(self, dt, onsite=0.0):
+        """
+        Function applying the Cayley propagator of a linear system, factorized once per step size.
+
+        The dense backend keeps the full operator, the banded backend a LAPACK
+        banded LU factorization and the sparse backend a SuperLU object. Only
+        the LINEAR_CACHE_SIZE most recent step sizes are kept, so adaptive
+        stepping does not grow the cache without bound.
+        """
+        key = (dt, onsite)
+        propagators = self._linear_propagators
+        if key in propagators:
+            return propagators[key]
+
+        diagonal = self.onsite_diagonal(np.zeros(self.N), onsite)
+
+        if self.backend == "dense":
+            H = self.H_base.copy()
+            H[np.diag_indices(self.N)] += diagonal
+            U = self.time_evolution_operator(H, dt)
+            propagate = U.__matmul__
+        elif self.backend == "sparse":
+            operator = self._build_sparse_operator(include_diagonal=True).astype(complex)
+            operator *= 0.5j * dt
+            operator.setdiag(operator.diagonal() + 1 + 0.5j * dt * diagonal)
+            factorization = splu(operator.tocsc())
+
+            def propagate(phi):
+                # (I - iH*dt/2) phi = 2 phi - (I + iH*dt/2) phi
+                return factorization.solve(2 * phi - operator @ phi)
+        else:
+            ab = 0.5j * dt * self.H_bands
+            ab[self.upper] += 1 + 0.5j * dt * diagonal
+            # gbtrf needs `lower` extra rows above the band for the pivoting fill-in
+            factor_storage = np.zeros((2 * self.lower + self.upper + 1, self.N), dtype=complex)
+            factor_storage[self.lower:] = ab
+            lu, pivots, info = lapack.zgbtrf(factor_storage, self.lower, self.upper)
+            if info != 0:
+                raise np.linalg.LinAlgError(f"singular Cayley matrix (zgbtrf info={info})")
+
+            def propagate(phi):
+                rhs = 2 * phi - banded_matvec(ab, self.lower, self.upper, phi)
+                solution, _ = lapack.zgbtrs(lu, self.lower, self.upper, rhs, pivots)
+                return solution
+
+        if len(propagators) >= self.LINEAR_CACHE_SIZE:
+            propagators.pop(next(iter(propagators)))
+        propagators[key] = propagate
+        return propagate
+
+    def fast_forward(self, phi, dt, n_steps, onsite=0.0):
+        """
+        Apply n_steps time steps of a linear system at once.
+
+        The one-step matrix of the system's integrator (the dense Cayley operator
+        of the dense backend, otherwise the step applied to every basis vector,
+        so the banded and sparse backends never build the dense Hamiltonian) is
+        raised to the n_steps power by repeated squaring, so the cost grows with
+        log(n_steps) rather than n_steps. The result equals n_steps calls of
+        `step` up to rounding.
+
+        Parameters:
+        -----------
+        phi : ndarray
+            Current wave function
+        dt : float
+            Time step
+        n_steps : int
+            Number of steps to jump
+        onsite : float
+            Linear onsite potential (default: 0.0)
+
+        Returns:
+        --------
+        phi_new : ndarray
+            Wave function after n_steps steps
+        """
+        if not self.is_linear:
+            raise ValueError("fast_forward requires a state-independent Hamiltonian (gamma1 = 0 or S = 0)")
+        if n_steps < 0:
+            raise ValueError("n_steps must be non-negative")
+
+        if self.method == "cayley" and self.backend == "dense":
+            H = self.get_hamiltonian(np.zeros(self.N), onsite=onsite)
+            one_step = self.time_evolution_operator(H, dt)
+        else:
+            basis = np.identity(self.N, dtype=complex)
+            one_step = np.column_stack([self.step(column, dt, onsite=onsite) for column in basis])
+
+        return np.linalg.matrix_power(one_step, n_steps) @ phi
+
+    def _sparse_step(self, diagonal, phi, dt, profiler=None):
+        """
+        Cayley step with the sparse backend, updating the operator's diagonal in place.
+        """
+        operator, hopping_values, diagonal_index = self._sparse_workspace
+
+        with section(profiler, "propagator"):
+            np.multiply(hopping_values, 0.5j * dt, out=operator.data)
+            operator.data[diagonal_index] += 1 + 0.5j * dt * diagonal
+
+            # (I - iH*dt/2) phi = 2 phi - (I + iH*dt/2) phi
+            rhs = 2 * phi - operator @ phi
+            factorization = splu(operator)
+
+        with section(profiler, "update"):
+            return factorization.solve(rhs)
+
+    def hamiltonian_matvec(self, diagonal):
+        """
+        Function applying the hopping Hamiltonian plus the given onsite diagonal to a vector.
+
+        The product uses the backend's storage (banded, CSR or dense), so the
+        full matrix is never formed for the banded backend.
+        """
+        if self.backend == "banded":
+            ab = self.H_bands.astype(complex)
+            ab[self.upper] += diagonal
+            return lambda v: banded_matvec(ab, self.lower, self.upper, v)
+
+        return lambda v: self.H_base @ v + diagonal * v
+
+    def _krylov_step(self, phi, dt, onsite=0.0, profiler=None):
+        """
+        Exponential-midpoint step: propagate half a step with the diagonal frozen
+        at phi, then the full step with the diagonal frozen at that midpoint state.
+        """
+        with section(profiler, "hamiltonian"):
+            diagonal = onsite + self.gain_loss_diagonal(phi)
+        with section(profiler, "propagator"):
+            midpoint = arnoldi_expm_multiply(self.hamiltonian_matvec(diagonal), phi, dt / 2,
+                                             self.krylov_dim, self.krylov_tolerance)
+
+        with section(profiler, "hamiltonian"):
+            diagonal = onsite + self.gain_loss_diagonal(midpoint)
+        with section(profiler, "update"):
+            return arnoldi_expm_multiply(self.hamiltonian_matvec(diagonal), phi, dt,
+                                         self.krylov_dim, self.krylov_tolerance)
+
+    @cached_property
+    def _hopping_matvec(self):
+        """
+        Matrix-vector product with the hopping Hamiltonian alone.
+        """
+        return self.hamiltonian_matvec(0.0)
+
+    @cached_property
+    def _hopping_propagators(self):
+        """
+        Dense exp(-iH_hop*dt) matrices of the dense backend, keyed by dt.
+        """
+        return {}
+
+    def hopping_propagate(self, phi, dt):
+        """
+        Apply the exact propagator exp(-iH_hop*dt) of the hopping terms to a state.
+
+        The dense backend caches one matrix exponential per step size, keeping
+        the LINEAR_CACHE_SIZE most recently used ones so that the trial step
+        sizes of adaptive stepping do not accumulate N x N matrices; the banded
+        and sparse backends use an Arnoldi expansion with the constant hopping
+        matrix, so nothing is rebuilt from step to step.
+        """
+        if self.backend == "dense":
+            propagators = self._hopping_propagators
+            propagator = propagators.pop(dt, None)
+            if propagator is None:
+                propagator = expm(-1j * dt * self.H_base)
+                if len(propagators) >= self.LINEAR_CACHE_SIZE:
+                    propagators.pop(next(iter(propagators)))
+            propagators[dt] = propagator
+            return propagator @ phi
+
+        return arnoldi_expm_multiply(self._hopping_matvec, phi, dt,
+                                     self.krylov_dim, self.krylov_tolerance)
+
+    def _split_step(self, phi, dt, onsite=0.0, profiler=None):
+        """
+        Strang (or Yoshida) split step: half a gain/loss flow, a full hopping
+        step, then another half gain/loss flow.
+        """
+        weights = self.YOSHIDA_WEIGHTS if self.method == "yoshida" else (1.0,)
+
+        for weight in weights:
+            h = weight * dt
+            with section(profiler, "update"):
+                phi = saturable_gain_loss_flow(self.gain_profile, self.loss_profile, self.S,
+                                               phi, h / 2)
+                phi = np.exp(-1j * onsite * h) * self.hopping_propagate(phi, h)
+                phi = saturable_gain_loss_flow(self.gain_profile, self.loss_profile, self.S,
+                                               phi, h / 2)
+
+        return phi
+
+
+class Stepper:
+    """
+    Fixed-step integrator of one lattice system with preallocated workspaces.
+
+    The Cayley and midpoint methods on the banded and dense backends fill
+    the gain terms, the band (or dense) storage of I + iH*dt/2 and the
+    right-hand side in buffers owned by the stepper, and solve with LAPACK
+    in place, so a step allocates no arrays of size N. Linear systems
+    factorize their propagator once. Other backends and methods fall back
+    to `system.step` and copy its result.
+
+    The system's parameters are read when the stepper is created, so build
+    a new stepper after changing them.
+    """
+
+    def __init__(self, system, dt, onsite=0.0, profiler=None):
+        """
+        Initialize the stepper.
+
+        Parameters:
+        -----------
+        system : LatticeSystem
+            The system to evolve
+        dt : float
+            Time step
+        onsite : float
+            Linear onsite potential (default: 0.0)
+        profiler : StepProfiler, optional
+            Collector for the time spent in each part of every step
+        """
+        self.system = system
+        self.dt = dt
+        self.onsite = onsite
+        self.profiler = profiler
+
+        N, lower, upper = system.N, system.lower, system.upper
+        if system.method not in ("cayley", "midpoint") or system.backend == "sparse":
+            self.mode = "fallback"
+            return
+        self.mode = system.backend
+        self.linear = system.is_linear
+
+        # 0.5j*dt*diagonal = 0.5j*dt*onsite + 0.5*dt*loss - 0.5*dt*gain / (1 + S|phi|^2), where
+        # only the last term changes from step to step and it is real
+        self._main_constant = 1 + 0.5j * dt * onsite + 0.5 * dt * system.loss_profile
+        self._gain_scale = -0.5 * dt * system.gain_profile
+        self._gain = np.empty(N)
+        self._rhs = np.empty(N, dtype=complex)
+        self._product = np.empty(N, dtype=complex)
+        self._next = np.empty(N, dtype=complex)
+        self._midpoint = np.empty(N, dtype=complex)
+
+        if self.mode == "dense":
+            self._hopping = 0.5j * dt * system.H_base
+            self._matrix = np.empty((N, N), dtype=complex, order="F")
+            self._main = self._matrix.reshape(-1, order="F")[::N + 1]
+            self._main_constant += self._hopping.diagonal()
+        else:
+            # Rows of the band stay contiguous for the element-wise updates; the solvers
+            # get their own storage: three diagonals for gtsv, or the column-major layout
+            # of gbsv with `lower` extra rows above the band for the pivoting fill-in
+            self._hopping = 0.5j * dt * system.H_bands
+            self._band = np.empty((lower + upper + 1, N), dtype=complex)
+            self._main = self._band[upper]
+            self._main_constant += self._hopping[upper]
+            if lower == upper == 1:
+                self._diagonals = (np.empty(N - 1, dtype=complex), np.empty(N, dtype=complex),
+                                   np.empty(N - 1, dtype=complex))
+            else:
+                self._storage = np.zeros((2 * lower + upper + 1, N), dtype=complex, order="F")
+
+        if self.linear:
+            # The matrix never changes: factorize it once and keep it for the right-hand sides
+            self._gain_terms(np.zeros(N))
+            self._fill_matrix()
+            if self.mode == "banded":
+                storage = np.zeros((2 * lower + upper + 1, N), dtype=complex, order="F")
+                storage[lower:] = self._band
+                self._lu, self._pivots, info = lapack.zgbtrf(storage, lower, upper)
+            else:
+                lu, pivots, info = lapack.zgetrf(self._matrix)
+                # U = (I + iH*dt/2)^(-1) (I - iH*dt/2), applied with one matrix-vector product
+                self._propagator, _ = lapack.zgetrs(lu, pivots, 2 * np.identity(N) - self._matrix)
+            if info != 0:
+                raise np.linalg.LinAlgError(f"singular Cayley matrix (info={info})")
+
+    def _gain_terms(self, phi):
+        """
+        Write -0.5*dt*gain / (1 + S|phi|^2) into the gain buffer.
+        """
+        gain = self._gain
+        np.abs(phi, out=gain)
+        np.multiply(gain, gain, out=gain)
+        gain *= self.system.S
+        gain += 1
+        np.divide(self._gain_scale, gain, out=gain)
+
+    def _fill_matrix(self):
+        """
+        Write I + iH*dt/2 with the current gain terms into the matrix buffer.
+        """
+        np.copyto(self._band if self.mode == "banded" else self._matrix, self._hopping)
+        # real and imaginary parts separately, so no complex temporary is needed for the cast
+        np.add(self._main_constant.real, self._gain, out=self._main.real)
+        np.copyto(self._main.imag, self._main_constant.imag)
+
+    def _build_rhs(self, phi):
+        """
+        Write (I - iH*dt/2) phi = 2 phi - (I + iH*dt/2) phi into the right-hand side buffer.
+        """
+        rhs, product = self._rhs, self._product
+
+        if self.mode == "dense":
+            np.dot(self._matrix, phi, out=product)
+            np.multiply(phi, 2, out=rhs)
+            rhs -= product
+            return
+
+        band, lower, upper = self._band, self.system.lower, self.system.upper
+        np.subtract(2, self._main, out=rhs)
+        rhs *= phi
+        for k in range(1, upper + 1):
+            np.multiply(band[upper - k, k:], phi[k:], out=product[:-k])
+            rhs[:-k] -= product[:-k]
+        for k in range(1, lower + 1):
+            np.multiply(band[upper + k, :-k], phi[:-k], out=product[k:])
+            rhs[k:] -= product[k:]
+
+    def _solve(self):
+        """
+        Solve the system in the buffers in place and return the solution buffer.
+        """
+        system = self.system
+        if self.linear and self.mode == "banded":
+            solution, info = lapack.zgbtrs(self._lu, system.lower, system.upper, self._rhs,
+                                           self._pivots, overwrite_b=True)
+        elif self.linear:
+            return np.dot(self._propagator, self._rhs, out=self._product)
+        elif self.mode == "banded" and system.lower == system.upper == 1:
+            sub, main, sup = self._diagonals
+            np.copyto(sub, self._band[2, :-1])
+            np.copyto(main, self._main)
+            np.copyto(sup, self._band[0, 1:])
+            _, _, _, solution, info = lapack.zgtsv(sub, main, sup, self._rhs, overwrite_dl=True,
+                                                   overwrite_d=True, overwrite_du=True,
+                                                   overwrite_b=True)
+        elif self.mode == "banded":
+            np.copyto(self._storage[system.lower:], self._band)
+            _, _, solution, info = lapack.zgbsv(system.lower, system.upper, self._storage, self._rhs,
+                                                overwrite_ab=True, overwrite_b=True)
+        else:
+            _, _, solution, info = lapack.zgesv(self._matrix, self._rhs, overwrite_a=True,
+                                                overwrite_b=True)
+        if info != 0:
+            raise np.linalg.LinAlgError(f"singular Cayley matrix (info={info})")
+        return solution
+
+    def _cayley(self, gain_state, phi):
+        """
+        Cayley step from phi with the gain evaluated at gain_state; returns the solution buffer.
+        """
+        profiler = self.profiler
+        with section(profiler, "hamiltonian"):
+            self._gain_terms(gain_state)
+        with section(profiler, "propagator"):
+            self._fill_matrix()
+            self._build_rhs(phi)
+        with section(profiler, "update"):
+            return self._solve()
+
+    def step(self, phi, out=None):
+        """
+        Advance a wave function by one time step.
+
+        Parameters:
+        -----------
+        phi : ndarray
+            Current wave function (complex)
+        out : ndarray, optional
+            Array receiving the new state; defaults to phi itself, i.e. an in-place update
+
+        Returns:
+        --------
+        out : ndarray
+            Wave function after one time step
+        """
+        if out is None:
+            out = phi
+        system, profiler = self.system, self.profiler
+
+        if self.mode == "fallback":
+            np.copyto(out, system.step(phi, self.dt, onsite=self.onsite, profiler=profiler))
+            return out
+
+        if self.linear:
+            with section(profiler, "propagator"):
+                if self.mode == "banded":
+                    self._build_rhs(phi)
+                else:
+                    np.copyto(self._rhs, phi)
+            with section(profiler, "update"):
+                np.copyto(out, self._solve())
+            return out
+
+        solution = self._cayley(phi, phi)
+
+        if system.method == "midpoint":
+            phi_new, midpoint = self._next, self._midpoint
+            for _ in range(system.implicit_max_iterations):
+                np.copyto(phi_new, solution)
+                np.add(phi, phi_new, out=midpoint)
+                midpoint *= 0.5
+                solution = self._cayley(midpoint, phi)
+                np.subtract(solution, phi_new, out=midpoint)
+                change = np.sqrt(np.vdot(midpoint, midpoint).real)
+                if change <= system.implicit_tolerance * np.sqrt(np.vdot(solution, solution).real):
+                    break
+
+        np.copyto(out, solution)
+        return out
@@ -1,13 +1,19 @@
 import numpy as np
+from topological_photonics.models.common import LatticeSystem
 
 
-class DiamondLatticeSystem:
+class DiamondLatticeSystem(LatticeSystem):
     """
     A class for simulating a Hamiltonian for the Diamond lattice model
     with nonlinear saturable gain on A-sites and constant loss on B- and C-sites.
     """
 
-    def __init__(self, n_cells, t1=1.0, t2=1.0, t3=1.0, t4=1.0, gamma1=1.0, gamma2=0.5, S=1.0):
+    # Sites couple to their first and second neighbours, so H is pentadiagonal
+    lower = 2
+    upper = 2
+
+    def __init__(self, n_cells, t1=1.0, t2=1.0, t3=1.0, t4=1.0, gamma1=1.0, gamma2=0.5, S=1.0,
+                 backend="banded", method="cayley"):
         """
         Initialize the Diamond lattice system.
 
@@ -29,7 +35,21 @@ class DiamondLatticeSystem:
             Loss parameter on B- and C-sites
         S : float
             Saturation parameter for nonlinear gain
+        backend : str
+            Stepping mode: "banded" applies the propagator with a pentadiagonal LU solve,
+            "sparse" stores the hopping terms as a CSR matrix and factorizes it with
+            an in-place diagonal update, "dense" builds and inverts the full N x N
+            operator every step
+        method : str
+            Time integrator: "cayley" for the second-order Cayley propagator,
+            "krylov" for exp(-iH*dt) applied with an Arnoldi expansion, "strang"
+            and "yoshida" for second- and fourth-order split steps between the
+            exact gain/loss flow and the hopping propagator, "midpoint" for a
+            Cayley step with the gain solved self-consistently at the midpoint state
         """
+        self._check_backend(backend)
+        self._check_method(method)
+
         self.n_cells = n_cells
         self.N = 3 * n_cells + 1  # Total number of sites (must be 1 mod 3 for Diamond model)
         self.t1 = t1
@@ -39,9 +59,15 @@ class DiamondLatticeSystem:
         self.gamma1 = gamma1
         self.gamma2 = gamma2
         self.S = S
+        self.backend = backend
+        self.method = method
+
+        # Initialize hopping terms (the dense H_base is built on first access)
+        self.H_bands = self._build_hopping_bands()
 
-        # Initialize base Hamiltonian
-        self.H_base = self._build_base_hamiltonian()
+        # Sublattice indices and per-site gain/loss strengths
+        self.sublattices = self._build_sublattices()
+        self.gain_profile, self.loss_profile = self._build_gain_loss_profiles()
 
     def _build_base_hamiltonian(self):
         """
@@ -68,89 +94,51 @@ class DiamondLatticeSystem:
 
         return H
 
-    def get_hamiltonian(self, phi=None, onsite=0.0):
+    def _build_hopping_bands(self):
         """
-        Get the full Hamiltonian including onsite terms.
+        Build the hopping terms in LAPACK banded storage (two sub- and two super-diagonals).
 
-        Parameters:
-        -----------
-        phi : array_like, optional
-            Wave function for nonlinear onsite potentials
-        onsite : float
-            Linear onsite potential (default: 0.0)
-
-        Returns:
-        --------
-        H : ndarray
-            Full Hamiltonian matrix
+        Row 2 - k holds H[i, i + k] in column i + k and row 2 + k holds
+        H[i + k, i] in column i, for k = 1, 2.
         """
-        H = self.H_base.copy()
+        bands = np.zeros((5, self.N), dtype=complex)
 
-        # Add linear onsite terms
-        for i in range(self.N):
-            H[i, i] += onsite
+        # A-B hopping (t1 within the cell, t3 to the next A-site)
+        bands[1, 1::3] = self.t1
+        bands[3, 0:-1:3] = self.t1
+        bands[0, 3::3] = self.t3
+        bands[4, 1:-2:3] = self.t3
 
-        # Add nonlinear gain/loss terms if phi is provided
-        if phi is not None:
-            H = self._add_nonlinear_terms(H, phi)
+        # A-C hopping (t2 within the cell, t4 to the next A-site)
+        bands[0, 2::3] = self.t2
+        bands[4, 0:-2:3] = self.t2
+        bands[1, 3::3] = self.t4
+        bands[3, 2:-1:3] = self.t4
 
-        return H
+        return bands
 
-    def _add_nonlinear_terms(self, H, phi):
+    def _build_sublattices(self):
+        """
+        Site indices of the A-, B- and C-sublattices.
         """
-        Add nonlinear gain and loss terms to the Hamiltonian.
+        return {
+            "A": np.arange(0, self.N, 3),
+            "B": np.arange(1, self.N, 3),
+            "C": np.arange(2, self.N, 3),
+        }
+
+    def _build_gain_loss_profiles(self):
+        """
+        Per-site gain and loss strengths.
         - A-sites (i = 0, 3, 6, ...): nonlinear saturable gain
         - B-sites (i = 1, 4, 7, ...): constant loss
         - C-sites (i = 2, 5, 8, ...): constant loss
-
-        Parameters:
-        -----------
-        H : ndarray
-            Hamiltonian matrix to modify
-        phi : array_like
-            Wave function
-
-        Returns:
-        --------
-        H : ndarray
-            Modified Hamiltonian with nonlinear terms
         """
-        # A-sites: nonlinear saturable gain
-        for i in range(0, self.N, 3):
-            intensity = np.abs(phi[i]) ** 2
-            gain = 1j * self.gamma1 / (1 + self.S * intensity)
-            H[i, i] += gain
-
-        # B-sites: constant loss
-        for i in range(1, self.N, 3):
-            loss = -1j * self.gamma2
-            H[i, i] += loss
-
-        # C-sites: constant loss
-        for i in range(2, self.N, 3):
-            loss = -1j * self.gamma2
-            H[i, i] += loss
+        gain_profile = np.zeros(self.N)
+        loss_profile = np.zeros(self.N)
 
-        return H
-
-    def time_evolution_operator(self, H, dt):
-        """
-        Calculate the second-order time evolution operator.
+        gain_profile[self.sublattices["A"]] = self.gamma1
+        loss_profile[self.sublattices["B"]] = self.gamma2
+        loss_profile[self.sublattices["C"]] = self.gamma2
 
-        U(t) = (I - iH*dt/2) * (I + iH*dt/2)^(-1)
-
-        Parameters:
-        -----------
-        H : ndarray
-            Hamiltonian matrix
-        dt : float
-            Time step
-
-        Returns:
-        --------
-        U : ndarray
-            Time evolution operator
-        """
-        I = np.identity(self.N)
-        U = np.dot(I - 1j * dt * H / 2, np.linalg.inv(I + 1j * dt * H / 2))
-        return U
+        return gain_profile, loss_profile
@@ -1,13 +1,15 @@
 import numpy as np
+from topological_photonics.models.common import LatticeSystem
 
 
-class NRSSHLatticeSystem:
+class NRSSHLatticeSystem(LatticeSystem):
     """
     A class for simulating a Hamiltonian for the NRSSH model
     with nonlinear saturable gain and constant loss dynamics.
     """
 
-    def __init__(self, n_cells, onsite=0.0, v=1.0, u=1.0, r=1.0, gamma1=1.0, gamma2=0.5, S=1.0):
+    def __init__(self, n_cells, onsite=0.0, v=1.0, u=1.0, r=1.0, gamma1=1.0, gamma2=0.5, S=1.0,
+                 backend="banded", method="cayley"):
         """
         Initialize the Hamiltonian system.
 
@@ -29,7 +31,21 @@ class NRSSHLatticeSystem:
             Loss parameter
         S : float
             Saturation parameter for nonlinear gain
+        backend : str
+            Stepping mode: "banded" applies the propagator with a tridiagonal solve,
+            "sparse" stores the hopping terms as a CSR matrix and factorizes it with
+            an in-place diagonal update, "dense" builds and inverts the full N x N
+            operator every step
+        method : str
+            Time integrator: "cayley" for the second-order Cayley propagator,
+            "krylov" for exp(-iH*dt) applied with an Arnoldi expansion, "strang"
+            and "yoshida" for second- and fourth-order split steps between the
+            exact gain/loss flow and the hopping propagator, "midpoint" for a
+            Cayley step with the gain solved self-consistently at the midpoint state
         """
+        self._check_backend(backend)
+        self._check_method(method)
+
         self.n_cells = n_cells
         self.N = 2 * n_cells  # Total number of sites
         self.r = r
@@ -39,9 +55,15 @@ class NRSSHLatticeSystem:
         self.gamma1 = gamma1
         self.gamma2 = gamma2
         self.S = S
+        self.backend = backend
+        self.method = method
+
+        # Initialize hopping terms (the dense H_base is built on first access)
+        self.H_bands = self._build_hopping_bands()
 
-        # Initialize base Hamiltonian
-        self.H_base = self._build_base_hamiltonian()
+        # Sublattice indices and per-site gain/loss strengths
+        self.sublattices = self._build_sublattices()
+        self.gain_profile, self.loss_profile = self._build_gain_loss_profiles()
 
     def _build_base_hamiltonian(self):
         """
@@ -61,75 +83,38 @@ class NRSSHLatticeSystem:
 
         return H
 
-    def get_hamiltonian(self, phi=None, onsite=0.0):
+    def _build_hopping_bands(self):
         """
-        Get the full Hamiltonian including onsite terms.
+        Build the hopping terms in LAPACK banded storage (one sub- and one super-diagonal).
 
-        Parameters:
-        -----------
-        phi : array_like, optional
-            Wave function for nonlinear onsite potentials
-        onsite : float
-            Linear onsite potential (default: 0.0)
-
-        Returns:
-        --------
-        H : ndarray
-            Full Hamiltonian matrix
+        Row 0 holds H[i, i + 1] in column i + 1, row 1 the main diagonal and
+        row 2 holds H[i + 1, i] in column i.
         """
-        H = self.H_base.copy()
+        bands = np.zeros((3, self.N), dtype=complex)
 
-        # Add linear onsite terms
-        for i in range(self.N):
-            H[i, i] += onsite
+        # Intra-cell hopping (non-reciprocal)
+        bands[0, 1::2] = self.v
+        bands[2, 0:-1:2] = self.u
 
-        # Add nonlinear gain/loss terms if phi is provided
-        if phi is not None:
-            H = self._add_nonlinear_terms(H, phi)
+        # Inter-cell hopping (reciprocal)
+        bands[0, 2::2] = self.r
+        bands[2, 1:-1:2] = self.r
 
-        return H
+        return bands
 
-    def _add_nonlinear_terms(self, H, phi):
+    def _build_sublattices(self):
         """
-        Add nonlinear gain and loss terms to the Hamiltonian.
-
-        Parameters:
-        -----------
-        H : ndarray
-            Hamiltonian matrix to modify
-        phi : array_like
-            Wave function
-
-        Returns:
-        --------
-        H : ndarray
-            Modified Hamiltonian with nonlinear terms
+        Site indices of the A- and B-sublattices.
         """
-        for i in range(self.N):
-            intensity = np.abs(phi[i]) ** 2
-            gain_loss = 1j * (self.gamma1 / (1 + self.S * intensity) - self.gamma2)
-            H[i, i] += gain_loss
-
-        return H
+        return {
+            "A": np.arange(0, self.N, 2),
+            "B": np.arange(1, self.N, 2),
+        }
 
-    def time_evolution_operator(self, H, dt):
+    def _build_gain_loss_profiles(self):
         """
-        Calculate the second-order time evolution operator.
-
-        U(t) = (I - iH*dt/2) * (I + iH*dt/2)^(-1)
-
-        Parameters:
-        -----------
-        H : ndarray
-            Hamiltonian matrix
-        dt : float
-            Time step
-
-        Returns:
-        --------
-        U : ndarray
-            Time evolution operator
+        Per-site gain and loss strengths: every site has both saturable gain and constant loss.
         """
-        I = np.identity(self.N)
-        U = np.dot(I - 1j * dt * H / 2, np.linalg.inv(I + 1j * dt * H / 2))
-        return U
+        gain_profile = np.full(self.N, float(self.gamma1))
+        loss_profile = np.full(self.N, float(self.gamma2))
+        return gain_profile, loss_profile
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+import numpy as np
+
+
+def system_parameters(system):
+    """
+    Collect the scalar parameters that define a lattice system.
+
+    Every int, float, bool or str attribute is included (n_cells, hoppings,
+    gamma1, gamma2, S, backend, ...). Arrays derived from these are skipped.
+    """
+    parameters = {}
+    for name, value in vars(system).items():
+        if isinstance(value, (bool, int, float, str, np.integer, np.floating)):
+            parameters[name] = value.item() if isinstance(value, np.generic) else value
+    return parameters
+
+
+def point_key(system, dt, tolerance, max_time, evolution_options=None):
+    """
+    Content-addressed key for one phase-grid point.
+
+    The key is a SHA-256 hash of the model class, all system parameters and
+    the solver settings, so any change to any of them gives a new key.
+    """
+    description = {
+        "model": f"{type(system).__module__}.{type(system).__qualname__}",
+        "parameters": system_parameters(system),
+        "solver": {
+            "dt": dt,
+            "tolerance": tolerance,
+            "max_time": max_time,
+            **(evolution_options or {}),
+        },
+    }
+    encoded = json.dumps(description, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent SQLite store of convergence results for single phase-grid points.
+
+    Entries are keyed by point_key and hold the convergence time and outcome
+    code of the point. Reads refresh an entry's access time, and
+    once the cache holds more than max_entries results the least recently used
+    ones are evicted.
+    """
+
+    def __init__(self, path, max_entries=100_000):
+        """
+        Open (or create) a result cache.
+
+        Parameters:
+        -----------
+        path : str
+            SQLite database file
+        max_entries : int
+            Maximum number of stored points before LRU eviction
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.path = path
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            "key TEXT PRIMARY KEY, time REAL NOT NULL, outcome INTEGER NOT NULL, "
+            "last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS points_last_access ON points (last_access)"
+        )
+        self._connection.commit()
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_many(self, keys):
+        """
+        Look up several points at once.
+
+        Returns:
+        --------
+        results : dict
+            Maps each cached key to its (time, outcome) pair
+        """
+        results = {}
+        keys = list(keys)
+
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._connection.execute(
+                f"SELECT key, time, outcome FROM points WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            results.update({key: (conv_time, outcome) for key, conv_time, outcome in rows})
+
+        if results:
+            now = time.time()
+            self._connection.executemany(
+                "UPDATE points SET last_access = ? WHERE key = ?",
+                [(now, key) for key in results],
+            )
+            self._connection.commit()
+
+        return results
+
+    def put_many(self, items):
+        """
+        Store several (key, time, outcome) results and evict old entries if needed.
+        """
+        now = time.time()
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO points (key, time, outcome, last_access) VALUES (?, ?, ?, ?)",
+            [(key, float(conv_time), int(outcome), now) for key, conv_time, outcome in items],
+        )
+        self._evict()
+        self._connection.commit()
+
+    def _evict(self):
+        """
+        Delete the least recently used entries beyond max_entries.
+        """
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM points WHERE key IN "
+                "(SELECT key FROM points ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        """
+        Remove every stored result.
+        """
+        self._connection.execute("DELETE FROM points")
+        self._connection.commit()
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+        self._connection.close()
@@ -0,0 +1,75 @@
+import json
+import os
+
+import numpy as np
+
+from topological_photonics.phases.cache import system_parameters
+
+
+def _settings_record(points, system, dt, tolerance, max_time, evolution_options):
+    """
+    JSON description of a sweep, used to check that a checkpoint belongs to it.
+
+    `system` is the system at one grid point; like cache.point_key, the record
+    includes its model class and all of its scalar parameters (n_cells,
+    hoppings, S, backend, method, ...), so a sweep of a different lattice
+    never resumes from the checkpoint.
+    """
+    return json.dumps({
+        "points": points,
+        "model": f"{type(system).__module__}.{type(system).__qualname__}",
+        "parameters": system_parameters(system),
+        "dt": dt,
+        "tolerance": tolerance,
+        "max_time": max_time,
+        "evolution_options": evolution_options or {},
+    }, sort_keys=True, default=repr)
+
+
+def save_checkpoint(path, convergence_times, outcomes, completed, settings):
+    """
+    Atomically write the state of a phase-grid sweep to an .npz file.
+
+    The data is written to a temporary file that then replaces `path`, so a
+    job killed mid-write never leaves a truncated checkpoint behind.
+
+    Parameters:
+    -----------
+    path : str
+        Checkpoint file
+    convergence_times : ndarray
+        2D array of convergence times so far
+    outcomes : ndarray
+        2D array of outcome codes so far
+    completed : ndarray
+        2D boolean array marking the grid points that have been evaluated
+    settings : str
+        Sweep description from _settings_record
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        np.savez(handle, convergence_times=convergence_times, outcomes=outcomes,
+                 completed=completed, settings=np.array(settings))
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, settings):
+    """
+    Load a phase-grid checkpoint written by save_checkpoint.
+
+    Raises a ValueError when the checkpoint was written for a different sweep.
+
+    Returns:
+    --------
+    convergence_times, outcomes, completed : ndarray
+        The saved arrays
+    """
+    with np.load(path) as data:
+        if str(data["settings"]) != settings:
+            raise ValueError(
+                f"checkpoint {path} was written for a different sweep: {data['settings']}"
+            )
+        return data["convergence_times"], data["outcomes"], data["completed"]
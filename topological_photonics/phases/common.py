@@ -1,10 +1,39 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import numpy as np
-import matplotlib.pyplot as plt
+from topological_photonics.dynamics.stepping import AdaptiveStepper
+from topological_photonics.instrumentation import section
+from topological_photonics.models.common import crank_nicolson_step_batched
+from topological_photonics.models.common import saturable_gain_loss
+from topological_photonics.phases.cache import ResultCache, point_key
+from topological_photonics.phases.checkpoint import _settings_record, load_checkpoint, save_checkpoint
+from topological_photonics.phases.outcomes import CONVERGED, OUTCOMES, TIME_LIMIT, DivergenceDetector
+from topological_photonics.plotting import pyplot
 
 
-def find_convergence_time(system, dt=0.1, tolerance=1e-2, max_time=50, verbose=False):
+def find_convergence_time(system, dt=0.1, tolerance=1e-2, max_time=50, verbose=False,
+                          adaptive=False, rtol=1e-4, atol=1e-8, profiler=None, early_stop=False,
+                          window=None, return_outcome=False):
     """
     Find the time it takes for a lattice system to converge to a final state.
+
+    With adaptive=True the step size is error-controlled (see AdaptiveStepper)
+    and starts at dt; at the default rtol with the first-order Cayley method
+    this is slower than fixed steps. The change in total intensity is then rescaled to a
+    step of length dt before it is compared with the tolerance. Times are
+    always physical times, so adaptive and fixed-step results can be compared
+    directly. A StepProfiler passed as `profiler` records the time spent in
+    each part of every step and the outcome of the run.
+
+    With early_stop=True a DivergenceDetector watches the last window / dt
+    steps (window is an evolution time, max_time / 10 by default) and ends
+    the run as soon as it recognizes blow-up, exponential growth or a limit
+    cycle, instead of evolving until max_time. Such runs count as not
+    converged. With return_outcome=True the second return value is the
+    outcome code (TIME_LIMIT, CONVERGED, BLOW_UP, GROWTH or OSCILLATION from
+    topological_photonics.phases.outcomes) instead of the converged flag.
     """
     N = system.N
     time = 0.0
@@ -13,44 +42,311 @@ def find_convergence_time(system, dt=0.1, tolerance=1e-2, max_time=50, verbose=F
     phi[0] = 1.0
 
     dif = tolerance + 1
-    converged = False
+    outcome = TIME_LIMIT
+    detector = None
+    if early_stop:
+        window = max_time / 10 if window is None else window
+        detector = DivergenceDetector(tolerance, max(8, int(round(window / dt))))
 
     if verbose:
         print(f"Finding convergence time for gamma1={system.gamma1:.3f}, gamma2={system.gamma2:.3f}")
 
+    if adaptive:
+        stepper = AdaptiveStepper(system, dt, rtol=rtol, atol=atol, profiler=profiler)
+    else:
+        stepper = system.stepper(dt, profiler=profiler)
+
+    intensity = np.vdot(phi, phi).real
+    steps = 0
     while dif >= tolerance:
-        H = system.get_hamiltonian(phi, onsite=0.0)
-        U_op = system.time_evolution_operator(H, dt)
-        phi_new = np.dot(U_op, phi)
+        if adaptive:
+            phi, h = stepper.step(phi, max_step=max_time - time)
+        else:
+            phi, h = stepper.step(phi), dt
 
-        dif = abs(sum(np.abs(phi_new) ** 2) - sum(np.abs(phi) ** 2))
+        with section(profiler, "convergence"):
+            new_intensity = np.vdot(phi, phi).real
+            change = new_intensity - intensity
+            intensity = new_intensity
+            if adaptive:
+                change *= dt / h
+            dif = abs(change)
 
-        phi = phi_new
-        time += dt
+        time += h
+        steps += 1
 
         if time >= max_time:
             if verbose:
                 print(f"  Reached time limit {max_time} without convergence")
             break
+
+        if detector is not None and dif >= tolerance:
+            outcome = detector.update(change, intensity) or TIME_LIMIT
+            if outcome != TIME_LIMIT:
+                if verbose:
+                    print(f"  Stopped at time = {time:.4f}: {OUTCOMES[outcome]}")
+                break
     else:
-        converged = True
+        outcome = CONVERGED
         if verbose:
             print(f"  Converged at time = {time:.4f}")
 
-    return time, converged
+    if verbose and adaptive:
+        print(f"  Adaptive steps: {stepper.accepted} accepted, {stepper.rejected} rejected")
+
+    if profiler is not None:
+        profiler.count_step(steps)
+        profiler.record_run(steps, time, phi, outcome == CONVERGED)
+
+    return time, outcome if return_outcome else outcome == CONVERGED
+
+
+def find_convergence_times(systems, dt=0.1, tolerance=1e-2, max_time=50, verbose=False,
+                           profiler=None):
+    """
+    Find convergence times for many lattice systems by evolving them together.
+
+    All states are stacked into one (N, n_systems) array and advanced with a
+    vectorized banded Crank-Nicolson solve. Systems that converge are dropped
+    from the batch, so later steps only work on the points still evolving.
+    Each step costs O(N) NumPy operations on vectors of the batch size, so
+    this only beats evolving the systems one by one when there are more
+    systems than sites.
+    The convergence criterion and time limit are the same as in
+    find_convergence_time.
+
+    Parameters:
+    -----------
+    systems : sequence
+        Lattice systems of the same model and size (only gamma1, gamma2, S may differ)
+    dt : float
+        Time step
+    tolerance : float
+        Convergence tolerance on the change in total intensity per step
+    max_time : float
+        Maximum evolution time
+    verbose : bool
+        Whether to print progress information
+    profiler : StepProfiler, optional
+        Collector for section timings; the batched solve is recorded as "update"
+        and every system's outcome as a run
+
+    Returns:
+    --------
+    times : ndarray
+        Time at which each system converged (or stopped)
+    converged : ndarray
+        Boolean array indicating which systems converged
+    """
+    n_systems = len(systems)
+    times = np.zeros(n_systems)
+    converged = np.zeros(n_systems, dtype=bool)
+    if n_systems == 0:
+        return times, converged
+
+    reference = systems[0]
+    if any(system.N != reference.N or type(system) is not type(reference) for system in systems):
+        raise ValueError("batched systems must share the same model and number of sites")
+    if any(system.method != "cayley" for system in systems):
+        raise ValueError("the batched engine only supports the cayley method")
+
+    lower, upper = reference.lower, reference.upper
+    # The batch is the last axis throughout, so every per-site operation is a contiguous vector op
+    hopping_bands = np.stack([system.H_bands for system in systems], axis=-1)
+    gain_profiles = np.stack([system.gain_profile for system in systems], axis=-1)
+    loss_profiles = np.stack([system.loss_profile for system in systems], axis=-1)
+    saturations = np.array([system.S for system in systems], dtype=float)
+
+    phi = np.zeros((reference.N, n_systems), dtype=complex)
+    phi[0] = 1.0
+    intensity = np.sum(np.abs(phi) ** 2, axis=0)
+
+    active = np.arange(n_systems)
+    time = 0.0
+    step_count = 0
+
+    if verbose:
+        print(f"Evolving {n_systems} systems together...")
+
+    while active.size:
+        with section(profiler, "hamiltonian"):
+            diagonals = saturable_gain_loss(gain_profiles[:, active], loss_profiles[:, active],
+                                            saturations[active], phi)
+        with section(profiler, "update"):
+            phi_new = crank_nicolson_step_batched(hopping_bands[..., active], lower, upper,
+                                                  diagonals, phi, dt)
+        with section(profiler, "convergence"):
+            intensity_new = np.sum(np.abs(phi_new) ** 2, axis=0)
+            dif = np.abs(intensity_new - intensity)
+
+        time += dt
+        step_count += 1
+        if profiler is not None:
+            profiler.count_step(active.size)
+
+        if time >= max_time:
+            times[active] = time
+            if profiler is not None:
+                for state in phi_new.T:
+                    profiler.record_run(step_count, time, state, False)
+            if verbose:
+                print(f"  Reached time limit {max_time} with {active.size} systems unconverged")
+            break
+
+        done = dif < tolerance
+        times[active[done]] = time
+        converged[active[done]] = True
+        if profiler is not None:
+            for state in phi_new[:, done].T:
+                profiler.record_run(step_count, time, state, True)
+
+        keep = ~done
+        active = active[keep]
+        phi = phi_new[:, keep]
+        intensity = intensity_new[keep]
+
+        if verbose and step_count % 100 == 0:
+            print(f"    Step {step_count}, time = {time:.2f}, {active.size} systems evolving")
 
+    return times, converged
 
-def create_phase_grid(points, system_factory, system_description, dt, tolerance, max_time, verbose):
+
+def _evaluate_points(system_factory, parameters, dt, tolerance, max_time, batched,
+                     evolution_options=None, profiler=None):
+    """
+    Find convergence times and outcome codes for a list of (gamma1, gamma2) pairs.
+
+    This is the unit of work sent to pool workers, so it must stay importable
+    at module level.
+    """
+    evolution_options = evolution_options or {}
+
+    if batched:
+        systems = [system_factory(gamma1, gamma2) for gamma1, gamma2 in parameters]
+        times, converged = find_convergence_times(systems, dt=dt, tolerance=tolerance,
+                                                  max_time=max_time, profiler=profiler)
+        return times, np.where(converged, CONVERGED, TIME_LIMIT)
+
+    times = np.zeros(len(parameters))
+    outcomes = np.zeros(len(parameters), dtype=int)
+    for k, (gamma1, gamma2) in enumerate(parameters):
+        times[k], outcomes[k] = find_convergence_time(
+            system_factory(gamma1, gamma2), dt=dt, tolerance=tolerance, max_time=max_time,
+            profiler=profiler, return_outcome=True, **evolution_options
+        )
+
+    return times, outcomes
+
+
+def _iter_point_results(system_factory, parameters, dt, tolerance, max_time, batched=False,
+                        workers=None, chunk_size=None, evolution_options=None, cache=None,
+                        profiler=None):
+    """
+    Evaluate (gamma1, gamma2) pairs in chunks and yield each finished chunk.
+
+    Yields (positions, times, outcomes, from_cache), where positions index into
+    `parameters`. Points already in the cache are yielded first as one chunk;
+    the rest are simulated and written back to the cache chunk by chunk.
+    Chunks are run in-process when workers is None or 1, otherwise they are
+    distributed over a process pool and yielded in completion order. A
+    profiler can only collect timings in-process.
+    """
+    if profiler is not None and workers is not None and workers > 1:
+        raise ValueError("a profiler cannot collect timings from pool workers")
+
+    pending = np.arange(len(parameters))
+
+    if cache is not None:
+        keys = [point_key(system_factory(gamma1, gamma2), dt, tolerance, max_time, evolution_options)
+                for gamma1, gamma2 in parameters]
+        hits = cache.get_many(keys)
+
+        cached = np.array([k for k in pending if keys[k] in hits], dtype=int)
+        if cached.size:
+            yield (cached,
+                   np.array([hits[keys[k]][0] for k in cached]),
+                   np.array([hits[keys[k]][1] for k in cached]),
+                   True)
+        pending = np.array([k for k in pending if keys[k] not in hits], dtype=int)
+
+    n_pending = len(pending)
+    if n_pending == 0:
+        return
+
+    if workers is None or workers == 1:
+        # In-process: the batched engine takes everything at once, the serial loop one point at a time
+        if chunk_size is None:
+            chunk_size = n_pending if batched else 1
+    elif chunk_size is None:
+        chunk_size = max(1, -(-n_pending // (4 * workers)))
+
+    chunks = [pending[start:start + chunk_size] for start in range(0, n_pending, chunk_size)]
+
+    def store(positions, times, outcomes):
+        if cache is not None:
+            cache.put_many(zip([keys[k] for k in positions], times, outcomes))
+
+    if workers is None or workers == 1:
+        for positions in chunks:
+            chunk_parameters = [parameters[k] for k in positions]
+            times, outcomes = _evaluate_points(
+                system_factory, chunk_parameters, dt, tolerance, max_time, batched,
+                evolution_options, profiler
+            )
+            store(positions, times, outcomes)
+            yield positions, times, outcomes, False
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_evaluate_points, system_factory, [parameters[k] for k in positions],
+                            dt, tolerance, max_time, batched, evolution_options): positions
+            for positions in chunks
+        }
+        for future in as_completed(futures):
+            times, outcomes = future.result()
+            store(futures[future], times, outcomes)
+            yield futures[future], times, outcomes, False
+
+
+def create_phase_grid(points, system_factory, system_description, dt, tolerance, max_time, verbose,
+                      batched=False, workers=None, chunk_size=None, evolution_options=None,
+                      cache=None, checkpoint=None, checkpoint_interval=60.0, resume=False,
+                      profiler=None, return_outcomes=False):
     """
     Evaluate convergence times over a gamma1-gamma2 parameter grid.
+
+    With batched=True grid points are evolved simultaneously by
+    find_convergence_times instead of one find_convergence_time call per point,
+    which is only faster when there are several times more points than sites.
+    With workers > 1 the grid is split into chunks of chunk_size points that
+    run on a process pool; system_factory must then be picklable (a
+    module-level function or functools.partial, not a closure).
+    Results are written back by grid index, so the output does not depend on
+    the order in which chunks finish.
+    evolution_options are extra keyword arguments for find_convergence_time
+    (e.g. {"adaptive": True}); the batched engine only supports fixed steps.
+    cache is a ResultCache (or the path of one): points whose model, parameters
+    and solver settings were computed before are read from it instead of
+    being simulated, and new results are added to it.
+    checkpoint is an .npz file that receives the results so far, and the set of
+    finished points, at most every checkpoint_interval seconds, when the sweep
+    ends and if it is interrupted. With resume=True an existing checkpoint for
+    the same sweep is loaded and its finished points are skipped.
+    profiler is a StepProfiler that collects per-step timings of the simulated
+    points; it requires in-process evaluation (workers None or 1).
+    With return_outcomes=True a 2D array of outcome codes (see
+    topological_photonics.phases.outcomes) is returned after converged_mask.
     """
     if points < 1:
         raise ValueError("points must be at least 1")
+    if batched and evolution_options:
+        raise ValueError("evolution_options are not supported by the batched engine")
 
     gamma1_array = np.linspace(0, 1, points)
     gamma2_array = np.linspace(0, 1, points)
     convergence_times = np.zeros((points, points))
-    converged_mask = np.zeros((points, points), dtype=bool)
+    outcomes = np.zeros((points, points), dtype=int)
 
     if verbose:
         print("Creating phase diagram...")
@@ -58,44 +354,336 @@ def create_phase_grid(points, system_factory, system_description, dt, tolerance,
         print(f"  Grid size: {points}x{points}")
         print(f"  System parameters: {system_description}")
         print(f"  Evolution parameters: dt={dt}, tolerance={tolerance}, max_time={max_time}")
+        if evolution_options:
+            print(f"  Evolution options: {evolution_options}")
+        if workers is not None and workers > 1:
+            print(f"  Workers: {workers}")
 
     max_converged_time = 0
     total_points = points * points
     completed_points = 0
     progress_interval = max(1, total_points // 10)
+    next_report = progress_interval
 
-    for i, gamma1 in enumerate(gamma1_array):
-        for j, gamma2 in enumerate(gamma2_array):
-            system = system_factory(gamma1, gamma2)
-            conv_time, converged = find_convergence_time(
-                system, dt=dt, tolerance=tolerance, max_time=max_time
-            )
+    completed = np.zeros((points, points), dtype=bool)
+
+    settings = _settings_record(points, system_factory(gamma1_array[0], gamma2_array[0]), dt,
+                                tolerance, max_time, evolution_options)
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        convergence_times, outcomes, completed = load_checkpoint(checkpoint, settings)
+        completed_points = int(np.sum(completed))
+        next_report = (completed_points // progress_interval + 1) * progress_interval
+        if np.any(outcomes == CONVERGED):
+            max_converged_time = np.max(convergence_times[outcomes == CONVERGED])
+        if verbose:
+            print(f"  Resumed {completed_points}/{total_points} points from {checkpoint}")
+
+    grid_indices = [(i, j) for i in range(points) for j in range(points) if not completed[i, j]]
+    parameters = [(gamma1_array[i], gamma2_array[j]) for i, j in grid_indices]
+    last_checkpoint = time.monotonic()
 
-            convergence_times[i, j] = conv_time
-            converged_mask[i, j] = converged
+    owns_cache = isinstance(cache, (str, os.PathLike))
+    if owns_cache:
+        cache = ResultCache(cache)
 
-            if converged and conv_time > max_converged_time:
-                max_converged_time = conv_time
+    try:
+        for positions, times, point_outcomes, from_cache in _iter_point_results(
+                system_factory, parameters, dt, tolerance, max_time,
+                batched=batched, workers=workers, chunk_size=chunk_size,
+                evolution_options=evolution_options, cache=cache, profiler=profiler):
+            for k, conv_time, outcome in zip(positions, times, point_outcomes):
+                i, j = grid_indices[k]
+                convergence_times[i, j] = conv_time
+                outcomes[i, j] = outcome
+                completed[i, j] = True
 
-            completed_points += 1
-            if verbose and completed_points % progress_interval == 0:
+                if outcome == CONVERGED and conv_time > max_converged_time:
+                    max_converged_time = conv_time
+
+            if verbose and from_cache:
+                print(f"  Loaded {len(positions)}/{total_points} points from cache")
+
+            completed_points += len(positions)
+            if verbose and completed_points >= next_report:
                 progress = (completed_points / total_points) * 100
                 print(f"  Progress: {progress:.0f}%")
+                next_report = (completed_points // progress_interval + 1) * progress_interval
+
+            if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                save_checkpoint(checkpoint, convergence_times, outcomes, completed, settings)
+                last_checkpoint = time.monotonic()
+    finally:
+        if owns_cache:
+            cache.close()
+        if checkpoint is not None:
+            save_checkpoint(checkpoint, convergence_times, outcomes, completed, settings)
+
+    converged_mask = outcomes == CONVERGED
 
     if verbose:
         converged_count = np.sum(converged_mask)
         print(f"  Completed! {converged_count}/{total_points} points converged")
+        _print_outcome_counts(outcomes)
         if max_converged_time > 0:
             print(f"  Maximum convergence time: {max_converged_time:.4f}")
 
+    if return_outcomes:
+        return gamma1_array, gamma2_array, convergence_times, converged_mask, outcomes
     return gamma1_array, gamma2_array, convergence_times, converged_mask
 
 
+def _print_outcome_counts(outcomes):
+    """
+    Print how many grid points ended with each outcome other than convergence.
+    """
+    codes, counts = np.unique(outcomes[outcomes != CONVERGED], return_counts=True)
+    for code, count in zip(codes, counts):
+        print(f"    {OUTCOMES[code]}: {count}")
+
+
+def _needs_refinement(times, converged, time_threshold):
+    """
+    Whether a quadtree cell with the given corner results straddles a boundary.
+
+    A cell is refined when its corners disagree on convergence or when their
+    convergence times differ by more than time_threshold.
+    """
+    if converged.any() != converged.all():
+        return True
+    return bool(converged.all() and np.ptp(times) > time_threshold)
+
+
+def create_refined_phase_grid(points, levels, system_factory, system_description, dt, tolerance,
+                              max_time, verbose, refine_threshold=0.1, batched=False, workers=None,
+                              chunk_size=None, evolution_options=None, cache=None,
+                              profiler=None, return_outcomes=False):
+    """
+    Evaluate convergence times with quadtree refinement around the phase boundaries.
+
+    The sweep starts from a uniform points x points grid and then, `levels`
+    times, splits every cell whose corners disagree on convergence or whose
+    convergence times differ by more than refine_threshold * max_time. Only
+    the new corner points of split cells are simulated. The final resolution
+    is that of a uniform grid with (points - 1) * 2**levels + 1 points per
+    axis; points inside cells that were never split are filled in by bilinear
+    interpolation of the cell's corner times.
+
+    The remaining options are the same as for create_phase_grid.
+
+    Returns:
+    --------
+    gamma1_array, gamma2_array : ndarray
+        Parameter arrays of the final resolution
+    convergence_times : ndarray
+        2D array of convergence times
+    converged_mask : ndarray
+        2D boolean array indicating which points converged
+    simulated_mask : ndarray
+        2D boolean array marking the points that were actually evaluated
+    outcomes : ndarray
+        2D array of outcome codes, only returned with return_outcomes=True;
+        interpolated points take the outcome of their cell
+    """
+    if points < 2:
+        raise ValueError("points must be at least 2 for a refined grid")
+    if levels < 0:
+        raise ValueError("levels must be non-negative")
+    if batched and evolution_options:
+        raise ValueError("evolution_options are not supported by the batched engine")
+
+    stride = 2 ** levels
+    fine_points = (points - 1) * stride + 1
+    gamma1_array = np.linspace(0, 1, fine_points)
+    gamma2_array = np.linspace(0, 1, fine_points)
+    convergence_times = np.zeros((fine_points, fine_points))
+    outcomes = np.zeros((fine_points, fine_points), dtype=int)
+    simulated_mask = np.zeros((fine_points, fine_points), dtype=bool)
+
+    if verbose:
+        print("Creating refined phase diagram...")
+        print("  Parameter ranges: gamma1=[0,1], gamma2=[0,1]")
+        print(f"  Coarse grid: {points}x{points}, {levels} refinement levels, "
+              f"final resolution {fine_points}x{fine_points}")
+        print(f"  System parameters: {system_description}")
+        print(f"  Evolution parameters: dt={dt}, tolerance={tolerance}, max_time={max_time}")
+
+    owns_cache = isinstance(cache, (str, os.PathLike))
+    if owns_cache:
+        cache = ResultCache(cache)
+
+    def evaluate(grid_indices):
+        grid_indices = [index for index in dict.fromkeys(grid_indices) if not simulated_mask[index]]
+        parameters = [(gamma1_array[i], gamma2_array[j]) for i, j in grid_indices]
+        for positions, times, point_outcomes, _ in _iter_point_results(
+                system_factory, parameters, dt, tolerance, max_time,
+                batched=batched, workers=workers, chunk_size=chunk_size,
+                evolution_options=evolution_options, cache=cache, profiler=profiler):
+            for k, conv_time, outcome in zip(positions, times, point_outcomes):
+                convergence_times[grid_indices[k]] = conv_time
+                outcomes[grid_indices[k]] = outcome
+                simulated_mask[grid_indices[k]] = True
+
+    time_threshold = refine_threshold * max_time
+    cells = [(i, j) for i in range(0, fine_points - 1, stride)
+             for j in range(0, fine_points - 1, stride)]
+    leaves = []
+
+    try:
+        evaluate([(i, j) for i in range(0, fine_points, stride) for j in range(0, fine_points, stride)])
+
+        while stride > 1:
+            split = []
+            for i, j in cells:
+                corners = (slice(i, i + stride + 1, stride), slice(j, j + stride + 1, stride))
+                if _needs_refinement(convergence_times[corners], outcomes[corners] == CONVERGED,
+                                     time_threshold):
+                    split.append((i, j))
+                else:
+                    leaves.append((i, j, stride))
+
+            half = stride // 2
+            evaluate([(i + di, j + dj) for i, j in split
+                      for di in (0, half, stride) for dj in (0, half, stride)])
+            cells = [(i + di, j + dj) for i, j in split for di in (0, half) for dj in (0, half)]
+            stride = half
+
+            if verbose:
+                print(f"  Refined {len(split)} cells, {int(np.sum(simulated_mask))} points simulated")
+    finally:
+        if owns_cache:
+            cache.close()
+
+    # Fill the interior of cells that were never split from their corners
+    for i, j, size in leaves:
+        weights = np.linspace(0, 1, size + 1)
+        corner_times = convergence_times[i:i + size + 1:size, j:j + size + 1:size]
+        block = (slice(i, i + size + 1), slice(j, j + size + 1))
+        interpolated = ((1 - weights)[:, None] * (1 - weights)[None, :] * corner_times[0, 0]
+                        + (1 - weights)[:, None] * weights[None, :] * corner_times[0, 1]
+                        + weights[:, None] * (1 - weights)[None, :] * corner_times[1, 0]
+                        + weights[:, None] * weights[None, :] * corner_times[1, 1])
+        unset = ~simulated_mask[block]
+        convergence_times[block][unset] = interpolated[unset]
+        outcomes[block][unset] = outcomes[i, j]
+
+    converged_mask = outcomes == CONVERGED
+
+    if verbose:
+        print(f"  Completed! Simulated {int(np.sum(simulated_mask))}/{fine_points ** 2} points, "
+              f"{np.sum(converged_mask)} points converged")
+        _print_outcome_counts(outcomes)
+
+    if return_outcomes:
+        return gamma1_array, gamma2_array, convergence_times, converged_mask, simulated_mask, outcomes
+    return gamma1_array, gamma2_array, convergence_times, converged_mask, simulated_mask
+
+
+def find_phase_boundary(points, system_factory, system_description, dt, tolerance, max_time,
+                        verbose, epsilon=1e-3, continuation=True, window=0.05,
+                        evolution_options=None):
+    """
+    Locate the convergence boundary in gamma2 for every gamma1 column by bisection.
+
+    For each of `points` gamma1 values in [0, 1] the gamma2 interval [0, 1] is
+    bisected on the `converged` outcome of find_convergence_time until the
+    bracket is narrower than epsilon, which costs O(log(1/epsilon))
+    simulations per column instead of a full sweep. With continuation=True
+    the search starts from a bracket of half-width `window` around the
+    previous column's boundary and widens it until the outcomes at its ends
+    differ. Where a column has several crossings, one of them is returned.
+
+    Returns:
+    --------
+    gamma1_array : ndarray
+        Array of gamma1 values
+    boundary : ndarray
+        gamma2 at the boundary for each gamma1, NaN where the outcome does not change
+    simulations : int
+        Number of find_convergence_time calls made
+    """
+    if points < 1:
+        raise ValueError("points must be at least 1")
+    if epsilon <= 0:
+        raise ValueError("epsilon must be positive")
+
+    gamma1_array = np.linspace(0, 1, points)
+    boundary = np.full(points, np.nan)
+    simulations = 0
+
+    if verbose:
+        print("Tracing phase boundary...")
+        print(f"  {points} gamma1 columns, gamma2 resolution {epsilon}")
+        print(f"  System parameters: {system_description}")
+        print(f"  Evolution parameters: dt={dt}, tolerance={tolerance}, max_time={max_time}")
+
+    for i, gamma1 in enumerate(gamma1_array):
+        outcomes = {}
+
+        def converged_at(gamma2):
+            nonlocal simulations
+            if gamma2 not in outcomes:
+                _, point_outcomes = _evaluate_points(system_factory, [(gamma1, gamma2)], dt,
+                                                     tolerance, max_time, False, evolution_options)
+                outcomes[gamma2] = point_outcomes[0] == CONVERGED
+                simulations += 1
+            return outcomes[gamma2]
+
+        previous = boundary[i - 1] if i > 0 else np.nan
+        if continuation and not np.isnan(previous):
+            width = window
+            low, high = max(0.0, previous - width), min(1.0, previous + width)
+            while converged_at(low) == converged_at(high) and (low > 0.0 or high < 1.0):
+                width *= 2
+                low, high = max(0.0, previous - width), min(1.0, previous + width)
+        else:
+            low, high = 0.0, 1.0
+
+        if converged_at(low) == converged_at(high):
+            if verbose:
+                print(f"  gamma1={gamma1:.3f}: no boundary")
+            continue
+
+        while high - low > epsilon:
+            middle = 0.5 * (low + high)
+            if converged_at(middle) == converged_at(low):
+                low = middle
+            else:
+                high = middle
+
+        boundary[i] = 0.5 * (low + high)
+        if verbose:
+            print(f"  gamma1={gamma1:.3f}: boundary at gamma2={boundary[i]:.4f}")
+
+    if verbose:
+        print(f"  Completed! {simulations} simulations")
+
+    return gamma1_array, boundary, simulations
+
+
+def _cell_edges(centers):
+    """
+    Edges of the cells centred on a sorted 1D grid, for pcolormesh.
+    """
+    centers = np.asarray(centers, dtype=float)
+    if centers.size == 1:
+        return np.array([centers[0] - 0.5, centers[0] + 0.5])
+
+    midpoints = 0.5 * (centers[1:] + centers[:-1])
+    return np.concatenate((
+        [centers[0] - (midpoints[0] - centers[0])],
+        midpoints,
+        [centers[-1] + (centers[-1] - midpoints[-1])],
+    ))
+
+
 def plot_phase_diagram_base(gamma1_array, gamma2_array, convergence_times, converged_mask,
                             S, dt, tolerance, max_time, title):
     """
     Plot the shared phase diagram scaffolding and return the color map used.
     """
+    plt = pyplot()
+    from matplotlib.colors import BoundaryNorm, ListedColormap
+
     n_colors = 50
     values = np.linspace(1, n_colors)
     normalized_values = values / n_colors
@@ -106,13 +694,12 @@ def plot_phase_diagram_base(gamma1_array, gamma2_array, convergence_times, conve
 
     normalization_factor = n_colors / max_time
 
-    for i, gamma1 in enumerate(gamma1_array):
-        for j, gamma2 in enumerate(gamma2_array):
-            if converged_mask[i, j]:
-                conv_time = convergence_times[i, j]
-                color_index = int(normalization_factor * conv_time)
-                color_index = min(color_index, n_colors - 1)
-                plt.scatter(gamma1, gamma2, marker='s', c=[colors[color_index]], s=50)
+    # One mesh artist for the whole grid; each bin of width max_time / n_colors
+    # gets one color and non-converged cells are masked out
+    times = np.ma.masked_where(~np.asarray(converged_mask).T, np.asarray(convergence_times).T)
+    norm = BoundaryNorm(np.linspace(0, max_time, n_colors + 1), n_colors, clip=True)
+    plt.pcolormesh(_cell_edges(gamma1_array), _cell_edges(gamma2_array), times,
+                   cmap=ListedColormap(colors), norm=norm, shading='flat')
 
     x_line = [0, 1]
     y_line = [0, 1]
@@ -1,14 +1,43 @@
-import matplotlib.pyplot as plt
+from functools import partial
+
 from topological_photonics.models.diamond_lattice import DiamondLatticeSystem
 from topological_photonics.phases.common import create_phase_grid
+from topological_photonics.phases.common import create_refined_phase_grid
 from topological_photonics.phases.common import find_convergence_time
+from topological_photonics.phases.common import find_phase_boundary
 from topological_photonics.phases.common import plot_phase_diagram_base
-from topological_photonics.plotting import output_file
+from topological_photonics.plotting import output_file, pyplot
+
+
+def build_system(gamma1, gamma2, n_cells, t1, t2, t3, t4, S, backend="banded", method="cayley"):
+    """
+    Build the lattice system for one (gamma1, gamma2) grid point.
+
+    Defined at module level so that partial(build_system, ...) can be pickled
+    and sent to process-pool workers.
+    """
+    return DiamondLatticeSystem(
+        n_cells=n_cells,
+        t1=t1,
+        t2=t2,
+        t3=t3,
+        t4=t4,
+        gamma1=gamma1,
+        gamma2=gamma2,
+        S=S,
+        backend=backend,
+        method=method
+    )
 
 
 def create_phase_diagram(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, n_cells=15,
                          points=20, dt=0.1, tolerance=1e-2, max_time=75,
-                         plot=True, verbose=True, output_dir="outputs"):
+                         plot=True, verbose=True, output_dir="outputs", backend="banded",
+                         method="cayley", batched=False, workers=None, adaptive=False,
+                         rtol=1e-4, atol=1e-8, cache=None, checkpoint=None,
+                         checkpoint_interval=60.0, resume=False,
+                         refine_levels=0, refine_threshold=0.1, profiler=None,
+                         early_stop=False, window=None, return_outcomes=False):
     """
     Create a phase diagram showing convergence times across gamma1-gamma2 parameter space.
 
@@ -32,6 +61,43 @@ def create_phase_diagram(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, n_cells=15,
         Whether to create and show the plot
     verbose : bool
         Whether to print progress information
+    backend : str
+        Stepping backend of the lattice ("banded", "sparse" or "dense")
+    method : str
+        Time integrator of the lattice ("cayley", "krylov", "strang", "yoshida" or "midpoint")
+    batched : bool
+        Whether to evolve all grid points together as one stacked state array
+        (faster only when the grid has several times more points than the lattice has sites)
+    workers : int, optional
+        Number of worker processes; grid points are distributed over a process pool when > 1
+    adaptive : bool
+        Whether to use error-controlled step sizes starting from dt
+    rtol, atol : float
+        Relative and absolute local error tolerances for adaptive stepping
+    cache : ResultCache or str, optional
+        Persistent result cache (or its SQLite path); previously computed points are reused
+    checkpoint : str, optional
+        .npz file where partial results are saved so an interrupted sweep can be resumed
+    checkpoint_interval : float
+        Minimum number of seconds between checkpoint writes (default: 60.0)
+    resume : bool
+        Load finished points from an existing checkpoint instead of recomputing them
+    refine_levels : int
+        Number of quadtree refinement levels around the phase boundaries; with
+        refine_levels > 0, `points` sets the coarse grid and the result has
+        (points - 1) * 2**refine_levels + 1 points per axis
+    refine_threshold : float
+        Convergence-time difference, as a fraction of max_time, above which a
+        converged cell is refined
+    profiler : StepProfiler, optional
+        Collector for per-step timings of the simulated points (in-process only)
+    early_stop : bool
+        Whether to stop runs recognized as blow-up, exponential growth or a
+        limit cycle before max_time (heuristic; see DivergenceDetector)
+    window : float, optional
+        Span of evolution time the divergence detector examines (default: max_time / 10)
+    return_outcomes : bool
+        Whether to also return the 2D array of outcome codes
 
     Returns:
     --------
@@ -43,20 +109,139 @@ def create_phase_diagram(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, n_cells=15,
         2D array of convergence times
     converged_mask : ndarray
         2D boolean array indicating which points converged
+    outcomes : ndarray
+        2D array of outcome codes, only returned with return_outcomes=True
     """
-    def system_factory(gamma1, gamma2):
-        return DiamondLatticeSystem(
-            n_cells=n_cells,
-            t1=t1,
-            t2=t2,
-            t3=t3,
-            t4=t4,
-            gamma1=gamma1,
-            gamma2=gamma2,
-            S=S
+    system_factory = partial(
+        build_system,
+        n_cells=n_cells,
+        t1=t1,
+        t2=t2,
+        t3=t3,
+        t4=t4,
+        S=S,
+        backend=backend,
+        method=method,
+    )
+
+    system_description = f"t1={t1}, t2={t2}, t3={t3}, t4={t4}, S={S}"
+    evolution_options = {}
+    if adaptive:
+        evolution_options.update(adaptive=True, rtol=rtol, atol=atol)
+    if early_stop:
+        evolution_options.update(early_stop=True, window=window)
+
+    if refine_levels > 0:
+        if checkpoint is not None:
+            raise ValueError("checkpoints are not supported with refine_levels > 0")
+        (gamma1_array, gamma2_array, convergence_times, converged_mask, _,
+         outcomes) = create_refined_phase_grid(
+            points=points,
+            levels=refine_levels,
+            system_factory=system_factory,
+            system_description=system_description,
+            dt=dt,
+            tolerance=tolerance,
+            max_time=max_time,
+            verbose=verbose,
+            refine_threshold=refine_threshold,
+            batched=batched,
+            workers=workers,
+            evolution_options=evolution_options,
+            cache=cache,
+            profiler=profiler,
+            return_outcomes=True,
         )
+    else:
+        gamma1_array, gamma2_array, convergence_times, converged_mask, outcomes = create_phase_grid(
+            points=points,
+            system_factory=system_factory,
+            system_description=system_description,
+            dt=dt,
+            tolerance=tolerance,
+            max_time=max_time,
+            verbose=verbose,
+            batched=batched,
+            workers=workers,
+            evolution_options=evolution_options,
+            cache=cache,
+            profiler=profiler,
+            checkpoint=checkpoint,
+            checkpoint_interval=checkpoint_interval,
+            resume=resume,
+            return_outcomes=True,
+        )
+    
+    if plot:
+        plot_phase_diagram(gamma1_array, gamma2_array, convergence_times,
+                            converged_mask, t1, t2, t3, t4, S, dt, tolerance, max_time, n_cells,
+                            output_dir=output_dir)
+
+    if return_outcomes:
+        return gamma1_array, gamma2_array, convergence_times, converged_mask, outcomes
+    return gamma1_array, gamma2_array, convergence_times, converged_mask
+
+
+def trace_phase_boundary(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, n_cells=15,
+                         points=20, dt=0.1, tolerance=1e-2, max_time=75, epsilon=1e-3,
+                         continuation=True, verbose=True, backend="banded", method="cayley",
+                         adaptive=False, rtol=1e-4, atol=1e-8):
+    """
+    Trace the convergence boundary in gamma2 for each gamma1 without a full grid sweep.
 
-    gamma1_array, gamma2_array, convergence_times, converged_mask = create_phase_grid(
+    Parameters:
+    -----------
+    t1, t2, t3, t4: float
+        Hopping parameters for the Diamond system
+    S : float
+        Saturation constant
+    n_cells : int
+        Number of unit cells
+    points : int
+        Number of gamma1 columns
+    dt : float
+        Time step for evolution
+    tolerance : float
+        Convergence tolerance
+    max_time : float
+        Maximum evolution time
+    epsilon : float
+        Width in gamma2 below which the bisection stops
+    continuation : bool
+        Whether to start each column's search around the previous column's boundary
+    verbose : bool
+        Whether to print progress information
+    backend : str
+        Stepping backend of the lattice ("banded", "sparse" or "dense")
+    method : str
+        Time integrator of the lattice ("cayley", "krylov", "strang", "yoshida" or "midpoint")
+    adaptive : bool
+        Whether to use error-controlled step sizes starting from dt
+    rtol, atol : float
+        Relative and absolute local error tolerances for adaptive stepping
+
+    Returns:
+    --------
+    gamma1_array : ndarray
+        Array of gamma1 values
+    boundary : ndarray
+        gamma2 at the convergence boundary, NaN for columns without one
+    simulations : int
+        Number of simulations run
+    """
+    system_factory = partial(
+        build_system,
+        n_cells=n_cells,
+        t1=t1,
+        t2=t2,
+        t3=t3,
+        t4=t4,
+        S=S,
+        backend=backend,
+        method=method,
+    )
+
+    return find_phase_boundary(
         points=points,
         system_factory=system_factory,
         system_description=f"t1={t1}, t2={t2}, t3={t3}, t4={t4}, S={S}",
@@ -64,14 +249,10 @@ def create_phase_diagram(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, n_cells=15,
         tolerance=tolerance,
         max_time=max_time,
         verbose=verbose,
+        epsilon=epsilon,
+        continuation=continuation,
+        evolution_options={"adaptive": True, "rtol": rtol, "atol": atol} if adaptive else None,
     )
-    
-    if plot:
-        plot_phase_diagram(gamma1_array, gamma2_array, convergence_times,
-                            converged_mask, t1, t2, t3, t4, S, dt, tolerance, max_time, n_cells,
-                            output_dir=output_dir)
-
-    return gamma1_array, gamma2_array, convergence_times, converged_mask
 
 
 def plot_phase_diagram(gamma1_array, gamma2_array, convergence_times, converged_mask,
@@ -79,6 +260,8 @@ def plot_phase_diagram(gamma1_array, gamma2_array, convergence_times, converged_
     """
     Internal function to create and save the phase diagram plot.
     """
+    plt = pyplot()
+
     plot_phase_diagram_base(
         gamma1_array,
         gamma2_array,
@@ -118,9 +301,9 @@ def plot_phase_diagram(gamma1_array, gamma2_array, convergence_times, converged_
 
 
 def plot_example_phase_diagram(t1=0.5, t2=0.1, t3=0.1, t4=0.5, S=1.0, points=20, max_time=75,
-                               verbose=True, output_dir="outputs"):
+                               verbose=True, output_dir="outputs", backend="banded", method="cayley"):
     """Plot an example phase diagram with default parameters."""
 
     return create_phase_diagram(t1=t1, t2=t2, t3=t3, t4=t4, S=S,
                                 points=points, max_time=max_time, verbose=verbose,
-                                output_dir=output_dir)
+                                output_dir=output_dir, backend=backend, method=method)
@@ -0,0 +1,121 @@
+"""
+Outcome codes of a convergence search and the early detector for runs that will not converge.
+"""
+import math
+
+import numpy as np
+
+TIME_LIMIT = 0
+CONVERGED = 1
+BLOW_UP = 2
+GROWTH = 3
+OSCILLATION = 4
+
+OUTCOMES = {
+    TIME_LIMIT: "time limit",
+    CONVERGED: "converged",
+    BLOW_UP: "blow-up",
+    GROWTH: "growth",
+    OSCILLATION: "oscillation",
+}
+
+
+class DivergenceDetector:
+    """
+    Recognize runs whose change in total intensity will not fall below the tolerance.
+
+    The signed change and the logarithm of the total intensity of every step
+    are kept in ring buffers of `window` steps, which are examined every
+    window // 4 steps once they are full:
+    - BLOW_UP: the intensity is not finite or exceeds BLOW_UP_INTENSITY
+    - GROWTH: every change in the window is at least the tolerance, the
+      intensity grows by at least a factor e^MIN_LOG_GROWTH, and the
+      exponential growth rates of the four quarters of the window agree to
+      within RATE_SPREAD. A front of saturated sites spreading through the
+      lattice grows polynomially, so its rate falls from quarter to quarter
+      and it is left to run.
+    - OSCILLATION: the change switches sign at least MIN_SIGN_CHANGES times
+      and in every quarter of the window, and the largest change of each
+      quarter is at least AMPLITUDE_RATIO times the largest of the first,
+      i.e. a limit cycle rather than a damped oscillation
+
+    A converging run has changes that shrink towards zero, which none of the
+    window tests accept. The window tests are heuristics, though: a run that
+    oscillates for a whole window and settles afterwards is stopped too early.
+    """
+
+    BLOW_UP_INTENSITY = 1e8
+    MIN_LOG_GROWTH = 1.0
+    RATE_SPREAD = 0.2
+    MIN_SIGN_CHANGES = 8
+    AMPLITUDE_RATIO = 0.9
+
+    def __init__(self, tolerance, window):
+        """
+        Initialize the detector.
+
+        Parameters:
+        -----------
+        tolerance : float
+            Convergence tolerance on the change in total intensity per step
+        window : int
+            Number of recent steps examined
+        """
+        if window < 8:
+            raise ValueError(f"window must be at least 8 steps, got {window}")
+        self.tolerance = tolerance
+        self.window = window
+        self.changes = np.zeros(window)
+        self.log_intensities = np.zeros(window)
+        self.quarters = np.linspace(0, window - 1, 5).astype(int)
+        self.count = 0
+
+    def update(self, change, intensity):
+        """
+        Record one step.
+
+        Parameters:
+        -----------
+        change : float
+            Signed change of the total intensity in this step
+        intensity : float
+            Total intensity after the step
+
+        Returns:
+        --------
+        outcome : int or None
+            BLOW_UP, GROWTH or OSCILLATION once the run is recognized, otherwise None
+        """
+        # Called on every step, so the bookkeeping stays on Python scalars
+        if not math.isfinite(intensity) or intensity > self.BLOW_UP_INTENSITY:
+            return BLOW_UP
+
+        window = self.window
+        position = self.count % window
+        self.changes[position] = change
+        self.log_intensities[position] = math.log(intensity)
+        self.count += 1
+        if self.count < window or self.count % (window // 4):
+            return None
+
+        changes = np.roll(self.changes, -position - 1)
+        edges = self.quarters
+
+        if changes.min() >= self.tolerance:
+            log_intensities = np.roll(self.log_intensities, -position - 1)
+            if log_intensities[-1] - log_intensities[0] >= self.MIN_LOG_GROWTH:
+                rates = np.diff(log_intensities[edges]) / np.diff(edges)
+                if rates.min() >= (1 - self.RATE_SPREAD) * rates.max():
+                    return GROWTH
+            return None
+
+        sign_changes = np.flatnonzero(np.signbit(changes[1:]) != np.signbit(changes[:-1]))
+        if len(sign_changes) < self.MIN_SIGN_CHANGES:
+            return None
+        if len(np.unique(np.searchsorted(edges[1:-1], sign_changes, side="right"))) < 4:
+            return None
+        amplitudes = [np.abs(changes[low:high + 1]).max() for low, high in zip(edges[:-1], edges[1:])]
+        if min(amplitudes) >= self.AMPLITUDE_RATIO * amplitudes[0]:
+            return OSCILLATION
+
+        return None
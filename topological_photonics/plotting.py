@@ -8,3 +8,16 @@ def output_file(output_dir, *path_parts):
     filename = os.path.join(output_dir, *path_parts)
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     return filename
+
+
+def pyplot():
+    """
+    Import matplotlib.pyplot on first use.
+
+    The solvers never import matplotlib themselves, so compute-only runs (and
+    process-pool workers) skip its import cost; plotting functions call this
+    helper when they actually draw.
+    """
+    import matplotlib.pyplot as plt
+
+    return plt